@@ -2,30 +2,121 @@
 Token and cost tracking for every LLM call. Person 4 (Glue).
 """
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import Any, Optional
 
 # Example pricing (adjust to actual Claude Sonnet 4)
 INPUT_PRICE_PER_1K = 0.003
 OUTPUT_PRICE_PER_1K = 0.015
+# Prompt caching: cache reads are billed at ~10% of base input, cache writes at +25%
+CACHE_READ_PRICE_PER_1K = INPUT_PRICE_PER_1K * 0.10
+CACHE_WRITE_PRICE_PER_1K = INPUT_PRICE_PER_1K * 1.25
 
 
 @dataclass
 class CostSnapshot:
     tokens_in: int = 0
     tokens_out: int = 0
+    cached_read: int = 0
+    cached_written: int = 0
     phase_cost_eur: float = 0.0
     total_cost_eur: float = 0.0
 
-    def add_usage(self, tokens_in: int, tokens_out: int) -> None:
+    def add_usage(
+        self,
+        tokens_in: int,
+        tokens_out: int,
+        cached_read: int = 0,
+        cached_written: int = 0,
+    ) -> None:
+        """
+        tokens_in is the full prompt size; cached_read / cached_written are the
+        parts of it served from / written to the prompt cache.
+        """
         self.tokens_in += tokens_in
         self.tokens_out += tokens_out
-        self.phase_cost_eur += (
-            tokens_in / 1000 * INPUT_PRICE_PER_1K + tokens_out / 1000 * OUTPUT_PRICE_PER_1K
+        self.cached_read += cached_read
+        self.cached_written += cached_written
+        delta = compute_cost_eur(tokens_in, tokens_out, cached_read, cached_written)
+        self.phase_cost_eur += delta
+        self.total_cost_eur += delta
+
+    def add_response_usage(self, response: Any) -> None:
+        """Add usage from an LLM response (Anthropic, OpenAI-style or LangChain message)."""
+        self.add_usage(*usage_from_response(response))
+
+    def start_phase(self) -> None:
+        """Reset the per-phase cost; totals keep accumulating."""
+        self.phase_cost_eur = 0.0
+
+    @property
+    def cache_hit_rate(self) -> float:
+        """Share of input tokens served from the prompt cache (0.0–1.0)."""
+        return self.cached_read / self.tokens_in if self.tokens_in else 0.0
+
+    def to_payload(self) -> dict:
+        """Cost dict for the WebSocket `cost` field."""
+        return {
+            "phase_cost": round(self.phase_cost_eur, 6),
+            "total_cost": round(self.total_cost_eur, 6),
+            "tokens_in": self.tokens_in,
+            "tokens_out": self.tokens_out,
+            "cache_hit_rate": round(self.cache_hit_rate, 4),
+        }
+
+
+def compute_cost_eur(
+    tokens_in: int,
+    tokens_out: int,
+    cached_read: int = 0,
+    cached_written: int = 0,
+) -> float:
+    uncached_in = max(tokens_in - cached_read - cached_written, 0)
+    return (
+        uncached_in / 1000 * INPUT_PRICE_PER_1K
+        + cached_read / 1000 * CACHE_READ_PRICE_PER_1K
+        + cached_written / 1000 * CACHE_WRITE_PRICE_PER_1K
+        + tokens_out / 1000 * OUTPUT_PRICE_PER_1K
+    )
+
+
+def usage_from_response(response: Any) -> tuple[int, int, int, int]:
+    """
+    Returns (tokens_in, tokens_out, cached_read, cached_written) from a response object.
+    Anthropic reports cache tokens separately from input_tokens, so they are added back
+    to get the full prompt size.
+    """
+    # LangChain AIMessage (Gemini, Claude via langchain)
+    meta: Optional[dict] = getattr(response, "usage_metadata", None)
+    if meta:
+        details = meta.get("input_token_details") or {}
+        return (
+            meta.get("input_tokens", 0),
+            meta.get("output_tokens", 0),
+            details.get("cache_read", 0) or 0,
+            details.get("cache_creation", 0) or 0,
         )
-        self.total_cost_eur = self.phase_cost_eur  # Can be extended to accumulate across phases
 
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return 0, 0, 0, 0
+
+    # Anthropic Messages API
+    if hasattr(usage, "input_tokens"):
+        cached_read = getattr(usage, "cache_read_input_tokens", 0) or 0
+        cached_written = getattr(usage, "cache_creation_input_tokens", 0) or 0
+        return (
+            usage.input_tokens + cached_read + cached_written,
+            usage.output_tokens,
+            cached_read,
+            cached_written,
+        )
 
-def compute_cost_eur(tokens_in: int, tokens_out: int) -> float:
+    # OpenAI-style (prompt_tokens includes cached tokens)
+    details = getattr(usage, "prompt_tokens_details", None)
+    cached_read = (getattr(details, "cached_tokens", 0) or 0) if details else 0
     return (
-        tokens_in / 1000 * INPUT_PRICE_PER_1K + tokens_out / 1000 * OUTPUT_PRICE_PER_1K
+        getattr(usage, "prompt_tokens", 0) or 0,
+        getattr(usage, "completion_tokens", 0) or 0,
+        cached_read,
+        0,
     )
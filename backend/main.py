@@ -4,16 +4,20 @@ Person 1 (Architect): Wire pipeline to WebSocket, error recovery.
 """
 from __future__ import annotations
 
+import asyncio
+import time
 import uuid
 from pathlib import Path
 
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+import orjson
+
+from fastapi import FastAPI, WebSocket
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse
 from pydantic import BaseModel
 
-# Placeholder until pipeline is implemented
-# from pipeline import run_pipeline_stream
+from pipeline import run_pipeline_async
+from session_store import get_session_store
 
 app = FastAPI(title="Crisis PR Agent", version="0.1.0")
 
@@ -25,13 +29,109 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# In-memory session store (replace with Redis/DB for production)
-sessions: dict[str, dict] = {}
+# Redis-backed when REDIS_URL is set, in-memory otherwise (see session_store.py)
+sessions = get_session_store()
+# Strong refs to running pipeline tasks (asyncio only keeps weak ones)
+_pipeline_tasks: set[asyncio.Task] = set()
 
 # Ordner für die Startseite (ohne Node/npm)
 STATIC_DIR = Path(__file__).resolve().parent / "static"
 
 
+# WebSocket batching: flush at most every FLUSH_INTERVAL_S or MAX_BATCH messages
+FLUSH_INTERVAL_S = 0.2
+MAX_BATCH = 32
+_CLOSE = object()
+
+# orjson (C) instead of stdlib json; numpy scalars/arrays and int keys allowed in data
+_ORJSON_OPTS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+# Pre-encoded frame pieces: batches are assembled from already-encoded messages
+_BATCH_PREFIX = b'{"batch":['
+_BATCH_SUFFIX = b"]}"
+_UNKNOWN_SESSION_FRAME = orjson.dumps(
+    {"phase": "error", "status": "error", "data": {"error": "Unknown session"}}
+).decode()
+
+
+def _encode(message: dict) -> bytes:
+    return orjson.dumps(message, option=_ORJSON_OPTS)
+
+
+class BatchedSender:
+    """
+    Coalesces outgoing WebSocket messages into one frame per flush interval.
+    A flush with a single message sends it as-is (legacy shape); otherwise
+    the frame is {"batch": [msg1, msg2, ...]}. Each message is encoded once
+    with orjson on push; a flush only joins bytes.
+    """
+
+    def __init__(self, websocket: WebSocket, interval: float = FLUSH_INTERVAL_S, max_batch: int = MAX_BATCH):
+        self._ws = websocket
+        self._interval = interval
+        self._max_batch = max_batch
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._flusher())
+
+    @property
+    def task(self) -> asyncio.Task | None:
+        """The flusher task; it ends early if a send fails (socket gone)."""
+        return self._task
+
+    def abort(self) -> None:
+        """Drop what is queued and stop the flusher (client disconnected)."""
+        if self._task is None:
+            return
+        if self._task.done():
+            if not self._task.cancelled():
+                self._task.exception()  # failed send to a closed socket: nothing to report
+        else:
+            self._task.cancel()
+
+    def push(self, message: dict) -> None:
+        self._queue.put_nowait(_encode(message))
+
+    async def close(self) -> None:
+        """Flush what is queued and stop the flusher."""
+        self._queue.put_nowait(_CLOSE)
+        if self._task:
+            await self._task
+
+    async def _send(self, messages: list[bytes]) -> None:
+        if len(messages) == 1:
+            frame = messages[0]
+        else:
+            frame = _BATCH_PREFIX + b",".join(messages) + _BATCH_SUFFIX
+        await self._ws.send_text(frame.decode())
+
+    async def _flusher(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            first = await self._queue.get()
+            if first is _CLOSE:
+                return
+            messages = [first]
+            deadline = loop.time() + self._interval
+            closing = False
+            while len(messages) < self._max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    msg = await asyncio.wait_for(self._queue.get(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    break
+                if msg is _CLOSE:
+                    closing = True
+                    break
+                messages.append(msg)
+            await self._send(messages)
+            if closing:
+                return
+
+
 @app.get("/", response_class=FileResponse)
 async def root():
     """Startseite im Browser: http://localhost:8000"""
@@ -42,58 +142,100 @@ class AnalyzeInput(BaseModel):
     input: str
 
 
+async def _run_session(session_id: str, input_text: str) -> None:
+    """Run the pipeline in the background; events go to the session store, not a socket."""
+    t0 = time.time()
+
+    async def push_message(phase: str, status: str, cost: dict, data: dict) -> None:
+        await sessions.publish(session_id, {
+            "phase": phase,
+            "status": status,
+            "elapsed_seconds": round(time.time() - t0, 1),
+            "cost": cost,
+            "data": data,
+        })
+
+    try:
+        report = await run_pipeline_async(input_text, session_id, push_message)
+        await sessions.set_report(session_id, report)
+        await sessions.publish(session_id, {"phase": "pipeline", "status": "done", "data": {}})
+    except asyncio.CancelledError:
+        # Server shutdown: still end the stream so subscribers do not wait forever
+        await sessions.publish(session_id, {
+            "phase": "error", "status": "error", "data": {"error": "Pipeline cancelled"},
+        })
+        raise
+    except Exception as e:
+        await sessions.publish(session_id, {"phase": "error", "status": "error", "data": {"error": str(e)}})
+
+
 @app.post("/api/analyze")
 async def analyze(input_body: AnalyzeInput):
-    """Start analysis; returns session_id. Client connects to /ws/{session_id}."""
+    """Start analysis in the background; returns session_id. Client connects to /ws/{session_id}."""
     session_id = str(uuid.uuid4())
-    sessions[session_id] = {"input": input_body.input, "report": {}}
-    # TODO: Kick off pipeline in background; it will push to WebSocket
+    await sessions.create(session_id, input_body.input)
+    task = asyncio.create_task(_run_session(session_id, input_body.input))
+    _pipeline_tasks.add(task)
+    task.add_done_callback(_pipeline_tasks.discard)
     return {"session_id": session_id}
 
 
 @app.websocket("/ws/{session_id}")
 async def websocket_endpoint(websocket: WebSocket, session_id: str):
     await websocket.accept()
-    if session_id not in sessions:
-        await websocket.send_json({"phase": "error", "status": "error", "data": {"error": "Unknown session"}})
+    if not await sessions.exists(session_id):
+        await websocket.send_text(_UNKNOWN_SESSION_FRAME)
         await websocket.close()
         return
+    sender = BatchedSender(websocket)
+    sender.start()
+
+    async def forward() -> None:
+        # Replays events already published, then follows the live stream
+        async for event in sessions.events(session_id):
+            sender.push(event)
+
+    async def wait_disconnect() -> None:
+        # The client sends nothing; reading is how a closed socket is noticed
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+
+    forward_task = asyncio.create_task(forward())
+    disconnect_task = asyncio.create_task(wait_disconnect())
     try:
-        # TODO: Person 1 — Stream from run_pipeline_stream(session_id, sessions[session_id]["input"])
-        # For now send one mock message so frontend can develop
-        await websocket.send_json({
-            "phase": "recon",
-            "status": "complete",
-            "elapsed_seconds": 0,
-            "cost": {"phase_cost": 0, "total_cost": 0, "tokens_in": 0, "tokens_out": 0},
-            "data": {"message": "Pipeline not yet connected — use mock data in frontend."},
-        })
-        # Keep connection open until pipeline completes or timeout
-        while True:
-            try:
-                await websocket.receive_text()
-            except WebSocketDisconnect:
-                break
-    except Exception as e:
-        await websocket.send_json({"phase": "error", "status": "error", "data": {"error": str(e)}})
+        # Stream ended, client left, or a send failed: whichever comes first
+        await asyncio.wait({forward_task, disconnect_task, sender.task}, return_when=asyncio.FIRST_COMPLETED)
     finally:
-        await websocket.close()
+        # Cancelling forward() closes the store subscription
+        for task in (forward_task, disconnect_task):
+            task.cancel()
+        await asyncio.gather(forward_task, disconnect_task, return_exceptions=True)
+        connected = disconnect_task.cancelled() and not sender.task.done()
+        if connected:
+            try:
+                await sender.close()
+                await websocket.close()
+            except Exception:
+                pass
+        else:
+            sender.abort()
 
 
 @app.get("/api/sessions/{session_id}/report")
 async def get_report(session_id: str):
     """Full JSON of all phases (for PDF export)."""
-    if session_id not in sessions:
+    report = await sessions.get_report(session_id)
+    if report is None:
         return {"error": "Session not found"}
-    return sessions[session_id].get("report", {})
+    return report
 
 
 @app.get("/api/sessions/{session_id}/export-pdf")
 async def export_pdf(session_id: str):
     """Return PDF file. Person 4 implements."""
-    if session_id not in sessions:
+    if not await sessions.exists(session_id):
         return {"error": "Session not found"}
-    # TODO: Person 4 — generate PDF from sessions[session_id]["report"]
+    # TODO: Person 4 — generate PDF from await sessions.get_report(session_id)
     return {"message": "PDF export not yet implemented"}
 
 
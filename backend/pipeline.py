@@ -1,26 +1,147 @@
 """
 LangGraph multi-agent pipeline: Recon → History → Strategy → Drafting → Costing.
 Person 1 (Architect): State machine, node wiring, WebSocket push.
+
+Drafting fans out one node per strategy via LangGraph `Send`, so the drafts are
+written concurrently and merged back by the `drafts` reducer.
 """
 from __future__ import annotations
 
-from typing import Any, Callable
+import asyncio
+import inspect
+import time
+from typing import Annotated, Any, Callable, TypedDict
+
+from langgraph.graph import END, START, StateGraph
+from langgraph.types import Send
 
-# from langgraph.graph import StateGraph  # uncomment when using LangGraph
+from agents.drafting import run_drafting
+from agents.history import run_history
+from agents.recon import run_recon
+from agents.strategy import run_strategy
+from cost_tracker import CostSnapshot
 
 PHASES = ["recon", "history", "strategy", "drafting", "costing"]
 
+# Max nodes LangGraph runs at once (bounds parallel drafting LLM calls)
+MAX_CONCURRENCY = 4
 
-def run_pipeline_sync(input_text: str, session_id: str, push_message: Callable) -> dict[str, Any]:
+
+def _merge_dicts(left: dict, right: dict) -> dict:
+    return {**left, **right}
+
+
+class PipelineState(TypedDict, total=False):
+    input_text: str
+    recon: dict[str, Any]
+    history: dict[str, Any]
+    strategy: dict[str, Any]
+    # Drafting branches each return {"drafts": {name: ...}}; merged here
+    drafts: Annotated[dict[str, Any], _merge_dicts]
+    # Set on Send payloads only: the strategy a drafting branch works on
+    current_strategy: dict[str, Any]
+    costing: dict[str, Any]
+
+
+def _build_graph(push_message: Callable, cost: CostSnapshot):
+    """Wire the nodes; each node pushes started/complete updates itself."""
+
+    async def _push(phase: str, status: str, data: dict) -> None:
+        result = push_message(phase, status, cost.to_payload(), data)
+        if inspect.isawaitable(result):
+            await result
+
+    async def recon(state: PipelineState) -> dict:
+        cost.start_phase()
+        await _push("recon", "started", {})
+        result = await asyncio.to_thread(run_recon, state["input_text"])
+        await _push("recon", "complete", result)
+        return {"recon": result}
+
+    async def history(state: PipelineState) -> dict:
+        cost.start_phase()
+        await _push("history", "started", {})
+        result = await asyncio.to_thread(run_history, state["input_text"], state["recon"])
+        await _push("history", "complete", result)
+        return {"history": result}
+
+    async def strategy(state: PipelineState) -> dict:
+        cost.start_phase()
+        await _push("strategy", "started", {})
+        result = await asyncio.to_thread(
+            run_strategy, state["input_text"], state["recon"], state["history"]
+        )
+        await _push("strategy", "complete", result)
+        return {"strategy": result}
+
+    def dispatch_drafting(state: PipelineState) -> list[Send] | str:
+        strategies = (state.get("strategy") or {}).get("strategies") or []
+        if not strategies:
+            return "costing"
+        return [Send("drafting", {**state, "current_strategy": st}) for st in strategies]
+
+    async def drafting(state: PipelineState) -> dict:
+        st = state["current_strategy"]
+        result = await asyncio.to_thread(
+            run_drafting,
+            state["input_text"],
+            state["recon"],
+            state["history"],
+            {"strategies": [st]},
+        )
+        drafts = result.get("drafts", {})
+        await _push("drafting", "progress", {"strategy": st.get("name", ""), "drafts": drafts})
+        return {"drafts": drafts}
+
+    async def costing(state: PipelineState) -> dict:
+        await _push("drafting", "complete", {"drafts": state.get("drafts", {})})
+        result = cost.to_payload()
+        await _push("costing", "complete", result)
+        return {"costing": result}
+
+    graph = StateGraph(PipelineState)
+    graph.add_node("recon", recon)
+    graph.add_node("history", history)
+    graph.add_node("strategy", strategy)
+    graph.add_node("drafting", drafting)
+    graph.add_node("costing", costing)
+
+    graph.add_edge(START, "recon")
+    graph.add_edge("recon", "history")
+    graph.add_edge("history", "strategy")
+    graph.add_conditional_edges("strategy", dispatch_drafting, ["drafting", "costing"])
+    graph.add_edge("drafting", "costing")
+    graph.add_edge("costing", END)
+    return graph.compile()
+
+
+async def run_pipeline_async(
+    input_text: str,
+    session_id: str,
+    push_message: Callable,
+    cost: CostSnapshot | None = None,
+) -> dict[str, Any]:
     """
     Run the full pipeline and call push_message(phase, status, cost, data) for each update.
-    Person 1 implements; Person 2 provides agent runners.
+    push_message may be sync or async. Returns the report keyed by phase.
     """
-    report = {}
-    # TODO: Build LangGraph with 5 nodes; each node:
-    #   1. push_message(phase, "started", ...)
-    #   2. result = run_agent_*(input_text, report)
-    #   3. report[phase] = result
-    #   4. push_message(phase, "complete", cost, result)
-    #   5. pass report to next node
-    return report
+    cost = cost or CostSnapshot()
+    app = _build_graph(push_message, cost)
+    t0 = time.time()
+    final = await app.ainvoke(
+        {"input_text": input_text, "drafts": {}},
+        config={"max_concurrency": MAX_CONCURRENCY, "metadata": {"session_id": session_id}},
+    )
+    print(f"[PIPELINE] Session {session_id} done in {time.time() - t0:.1f}s")
+    return {
+        "recon": final.get("recon", {}),
+        "history": final.get("history", {}),
+        "strategy": final.get("strategy", {}),
+        "drafting": {"drafts": final.get("drafts", {})},
+        "costing": final.get("costing", {}),
+    }
+
+
+def run_pipeline_sync(input_text: str, session_id: str, push_message: Callable) -> dict[str, Any]:
+    """Blocking wrapper around run_pipeline_async (CLI / scripts)."""
+    return asyncio.run(run_pipeline_async(input_text, session_id, push_message))
@@ -0,0 +1,161 @@
+"""
+Session store for the WebSocket pipeline. Person 1 (Architect).
+
+Holds per-session input, final report and the stream of phase events.
+Uses Redis when REDIS_URL is set (shared across workers, survives restarts),
+otherwise an in-process store for local dev.
+
+Redis keys (1h TTL):
+  session:{id}:input   — user input (str)
+  session:{id}:report  — final report (JSON)
+  session:{id}:events  — list of phase events (JSON), replayed to late subscribers;
+                         the same name is the pub/sub channel that wakes subscribers
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+from typing import Any, AsyncIterator
+
+import orjson
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:
+    aioredis = None  # type: ignore[assignment]
+
+SESSION_TTL_S = 3600
+
+
+def is_terminal(event: dict) -> bool:
+    """Last event of a session: pipeline finished or failed."""
+    return event.get("status") in ("done", "error")
+
+
+class InMemorySessionStore:
+    """Single-process store (dev). Lost on restart; sessions are dropped SESSION_TTL_S after their terminal event."""
+
+    def __init__(self) -> None:
+        self._sessions: dict[str, dict[str, Any]] = {}
+        self._events: dict[str, list[dict]] = {}
+        self._conds: dict[str, asyncio.Condition] = {}
+
+    async def create(self, session_id: str, input_text: str) -> None:
+        self._sessions[session_id] = {"input": input_text, "report": {}}
+        self._events[session_id] = []
+        self._conds[session_id] = asyncio.Condition()
+
+    async def exists(self, session_id: str) -> bool:
+        return session_id in self._sessions
+
+    async def get_input(self, session_id: str) -> str | None:
+        session = self._sessions.get(session_id)
+        return session["input"] if session else None
+
+    async def get_report(self, session_id: str) -> dict | None:
+        session = self._sessions.get(session_id)
+        return session["report"] if session else None
+
+    async def set_report(self, session_id: str, report: dict) -> None:
+        if session_id in self._sessions:
+            self._sessions[session_id]["report"] = report
+
+    async def publish(self, session_id: str, event: dict) -> None:
+        cond = self._conds[session_id]
+        async with cond:
+            self._events[session_id].append(event)
+            cond.notify_all()
+        if is_terminal(event):
+            asyncio.get_running_loop().call_later(SESSION_TTL_S, self._evict, session_id)
+
+    def _evict(self, session_id: str) -> None:
+        self._sessions.pop(session_id, None)
+        self._events.pop(session_id, None)
+        self._conds.pop(session_id, None)
+
+    async def events(self, session_id: str) -> AsyncIterator[dict]:
+        """Yield every event of the session (past ones first) until the terminal one."""
+        cond = self._conds[session_id]
+        cursor = 0
+        while True:
+            async with cond:
+                await cond.wait_for(lambda: len(self._events[session_id]) > cursor)
+                batch = self._events[session_id][cursor:]
+            cursor += len(batch)
+            for event in batch:
+                yield event
+                if is_terminal(event):
+                    return
+
+
+class RedisSessionStore:
+    """Redis-backed store: any worker can run the pipeline or serve the WebSocket."""
+
+    def __init__(self, url: str) -> None:
+        self._redis = aioredis.from_url(url)
+
+    @staticmethod
+    def _key(session_id: str, name: str) -> str:
+        return f"session:{session_id}:{name}"
+
+    async def create(self, session_id: str, input_text: str) -> None:
+        pipe = self._redis.pipeline()
+        pipe.setex(self._key(session_id, "input"), SESSION_TTL_S, input_text)
+        pipe.setex(self._key(session_id, "report"), SESSION_TTL_S, b"{}")
+        await pipe.execute()
+
+    async def exists(self, session_id: str) -> bool:
+        return bool(await self._redis.exists(self._key(session_id, "input")))
+
+    async def get_input(self, session_id: str) -> str | None:
+        raw = await self._redis.get(self._key(session_id, "input"))
+        return raw.decode() if raw is not None else None
+
+    async def get_report(self, session_id: str) -> dict | None:
+        raw = await self._redis.get(self._key(session_id, "report"))
+        return orjson.loads(raw) if raw is not None else None
+
+    async def set_report(self, session_id: str, report: dict) -> None:
+        await self._redis.setex(self._key(session_id, "report"), SESSION_TTL_S, orjson.dumps(report))
+
+    async def publish(self, session_id: str, event: dict) -> None:
+        key = self._key(session_id, "events")
+        pipe = self._redis.pipeline()
+        pipe.rpush(key, orjson.dumps(event))
+        pipe.expire(key, SESSION_TTL_S)
+        pipe.publish(key, b"1")
+        await pipe.execute()
+
+    async def events(self, session_id: str) -> AsyncIterator[dict]:
+        """
+        Yield every event of the session until the terminal one.
+        Subscribes before reading the list so no event published in between is missed.
+        """
+        key = self._key(session_id, "events")
+        pubsub = self._redis.pubsub()
+        await pubsub.subscribe(key)
+        cursor = 0
+        try:
+            while True:
+                batch = await self._redis.lrange(key, cursor, -1)
+                cursor += len(batch)
+                for raw in batch:
+                    event = orjson.loads(raw)
+                    yield event
+                    if is_terminal(event):
+                        return
+                if not batch:
+                    await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+        finally:
+            await pubsub.unsubscribe(key)
+            await pubsub.aclose()
+
+
+def get_session_store() -> InMemorySessionStore | RedisSessionStore:
+    """Redis store if REDIS_URL is set and redis is installed, else in-memory."""
+    url = os.getenv("REDIS_URL")
+    if url and aioredis is not None:
+        return RedisSessionStore(url)
+    if url:
+        print("[SESSIONS] REDIS_URL set but redis package missing — using in-memory store.")
+    return InMemorySessionStore()
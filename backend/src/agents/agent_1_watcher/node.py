@@ -5,14 +5,29 @@ Collects articles via Tavily, scores Authority/Severity via Gemini,
 computes Recency Multiplier and Exposure Score.
 Sets customer_id and crisis_id for Paid.ai (Agents 2, 3, 4).
 """
-import time
+import asyncio
+import hashlib
+import re
+import unicodedata
 import uuid
+from collections import defaultdict
 from datetime import datetime
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from operator import itemgetter
+import numpy as np
 from dateutil import parser as date_parser
-
-from src.graph.state import GraphState
-from src.clients.tavily_client import tavily_client, search_news, _COMPANY_ALIASES
-from src.clients.llm_client import llm
+import orjson
+from pydantic import ValidationError
+
+from src.graph.state import Article, GraphState
+from src.clients.tavily_client import search_news_async, _COMPANY_ALIASES
+from src.clients.http import loop_local, run_sync
+from src.clients.llm_client import llm, loop_llm
+from src.utils.llm_cache import cache_get, cache_set, content_key
+from src.utils.log import get_logger
+from src.utils.tokens import trim_to_tokens
+from src.utils.urls import canonical_url
 from src.shared.types import (
     ArticleScores,
     ArticleClusteringResult,
@@ -23,6 +38,17 @@ from src.shared.types import (
     SENTIMENT_WEIGHTS,
 )
 
+logger = get_logger("AGENT 1")
+
+# Structured-output bindings built once (each call would rebuild the schema Runnable);
+# the async clustering one is built once per event loop
+_PARAGRAPH_LLM = llm.with_structured_output(ParagraphDecisions) if llm else None
+
+
+def _cluster_llm():
+    """Clustering binding for the running loop (async Gemini clients cannot cross loops)."""
+    return loop_local("agent1_cluster", lambda: loop_llm().with_structured_output(ArticleClusteringResult))
+
 
 # Paywall indicators: content likely truncated behind a paywall (avoid footer phrases like "subscribe to newsletter")
 _PAYWALL_PATTERNS = (
@@ -39,54 +65,116 @@ _PAYWALL_PATTERNS = (
     "wsj subscription",
 )
 
+# Newsletter / promo page titles (skipped before calling Gemini)
+_NEWSLETTER_TITLE_PATTERNS = ("sign up for", "newsletter", "get our newsletter", "subscribe to our")
+
+
+# Static prompt prefixes are module-level constants placed BEFORE the dynamic
+# fields: Gemini caches repeated request prefixes, and any byte drift in the
+# prefix (e.g. interpolating the title into it) defeats the cache.
+# Implicit caching only: an explicit cachedContent needs >= 1024 tokens on
+# gemini-2.5-flash, and these prefixes are ~600 tokens.
+_FILTER_INSTRUCTIONS = """Below are numbered paragraphs from a raw web page. Some belong to the article whose title is given; others are comments, navigation, related articles, footers, or ads.
+
+For each numbered paragraph, output true if it belongs to the article, false otherwise.
+Return exactly one boolean per paragraph, in order.
+"""
+
+
+def _filter_batch_prompt(title: str, count: int, numbered: str) -> str:
+    """Static instructions + per-batch part (f-string: no format-spec parsing per call)."""
+    return (
+        f"{_FILTER_INSTRUCTIONS}\n"
+        f'The article is titled: "{title}"\n'
+        f"Number of paragraphs: {count} (return exactly {count} booleans)\n\n"
+        f"Paragraphs:\n{numbered}\n"
+    )
+
+
+# Paragraph breaks: one or more blank lines
+_PARAGRAPH_SPLIT_RE = re.compile(r"\n\s*\n")
+
+# Markers of non-article text (comments, nav, promos). Content without any of them
+# is treated as already clean and not sent to Gemini for paragraph filtering.
+_BOILERPLATE_MARKERS = (
+    "related articles",
+    "read more",
+    "sign up",
+    "newsletter",
+    "subscribe",
+    "advertisement",
+    "comments",
+    "share this",
+    "cookie",
+    "all rights reserved",
+)
+# Boilerplate or paywall text: one scan decides whether the page needs filtering
+_NEEDS_FILTER_RE = re.compile(
+    "|".join(map(re.escape, _BOILERPLATE_MARKERS + _PAYWALL_PATTERNS)), re.IGNORECASE
+)
+
+
+def _filter_batch(title: str, batch: list[str]) -> list[bool] | None:
+    """
+    One Gemini call: keep/drop decision per paragraph of the batch.
+    Cached by content hash of (title, batch) — identical pages are never re-analyzed.
+    Returns None on count mismatch (caller keeps the batch). Raises on LLM error.
+    """
+    key = content_key(title, *batch)
+    cached = cache_get("paragraph_filter", key)
+    if cached is not None:
+        return cached
+
+    numbered = "\n\n".join(f"[{i+1}] {p}" for i, p in enumerate(batch))
+    prompt = _filter_batch_prompt(title, len(batch), numbered)
+    result = _PARAGRAPH_LLM.invoke(prompt)
+    decisions = list(result.decisions) if hasattr(result, "decisions") else []
+    if len(decisions) != len(batch):
+        return None
+    cache_set("paragraph_filter", key, decisions)
+    return decisions
+
 
 def _filter_content_to_article(title: str, content: str) -> str:
     """
     Keeps only paragraphs that belong to the article (by title).
     Uses chunk-based selection: Gemini returns true/false per paragraph,
     we keep only those marked true. Text is never rewritten — only filtered.
+
+    Only needed for full Jina pages: watcher_node works on Tavily snippets and
+    makes a single analysis call per batch, where is_substantive_article already
+    rejects boilerplate-only pages. Not called from the watcher flow.
     """
     if not content or not content.strip() or len(content) < 100:
         return content
     if not llm:
         return content
 
-    raw = (content or "").strip()[:8000]
-    paragraphs = [p.strip() for p in raw.split("\n\n") if p.strip()]
+    raw = content.strip()[:8000]
+    paragraphs = [p for p in (chunk.strip() for chunk in _PARAGRAPH_SPLIT_RE.split(raw)) if p]
 
     if not paragraphs:
         return content
     if len(paragraphs) == 1:
         return content
+    if not _NEEDS_FILTER_RE.search(raw):
+        return content  # Already clean: nothing for the LLM to remove
 
     BATCH_SIZE = 15
     kept = []
-    structured_llm = llm.with_structured_output(ParagraphDecisions)
 
     for start in range(0, len(paragraphs), BATCH_SIZE):
         batch = paragraphs[start : start + BATCH_SIZE]
-        numbered = "\n\n".join(f"[{i+1}] {p}" for i, p in enumerate(batch))
-        prompt = f"""The article is titled: "{title[:200]}"
-
-Below are numbered paragraphs from a raw web page. Some belong to this article; others are comments, navigation, related articles, footers, or ads.
-
-For each paragraph [1] to [{len(batch)}], output true if it belongs to the article, false otherwise.
-Return exactly {len(batch)} booleans in order.
-
-Paragraphs:
-{numbered}
-"""
         try:
-            result = structured_llm.invoke(prompt)
-            decisions = result.decisions if hasattr(result, "decisions") else []
-            if len(decisions) != len(batch):
+            decisions = _filter_batch(title[:200], batch)
+            if decisions is None:
                 kept.extend(batch)  # fallback: keep all if count mismatch
             else:
                 for para, keep in zip(batch, decisions):
                     if keep:
                         kept.append(para)
         except Exception as e:
-            print(f"[AGENT 1] Content filter error for '{title[:50]}...': {e}")
+            logger.warning("Content filter error for '%s...': %s", title[:50], e)
             return content
 
     if not kept:
@@ -94,46 +182,71 @@ Paragraphs:
     return "\n\n".join(kept)
 
 
-def _is_likely_paywalled(content: str) -> bool:
-    """Returns True if the content suggests the article is behind a paywall."""
-    if not content or not content.strip():
-        return True  # No content = treat as paywalled (unusable)
-    lower = content.lower()
-    return any(p in lower for p in _PAYWALL_PATTERNS)
+@lru_cache(maxsize=4096)
+def _parse_pub_date(pub_date_str: str) -> datetime | None:
+    """
+    Parses a publication date to a naive local datetime (None if unparseable),
+    comparable with datetime.now(). Fast paths first: ISO 8601 (C parser, accepts
+    "Z" since 3.11), then RFC 2822; dateutil only as a fallback.
+    Cached on the stripped string: dates repeat within a result set (same-day
+    articles) and across runs. Only the age computation depends on now().
+    """
+    pub = None
+    try:
+        pub = datetime.fromisoformat(pub_date_str)
+    except ValueError:
+        try:
+            pub = parsedate_to_datetime(pub_date_str)
+        except (TypeError, ValueError, IndexError):
+            try:
+                pub = date_parser.parse(pub_date_str)
+            except (ValueError, TypeError, OverflowError):
+                return None
+    if pub is None:
+        return None
+    # Convert offsets to local time before dropping tzinfo: "+02:00" must not skew the 2h bucket
+    return pub.astimezone().replace(tzinfo=None) if pub.tzinfo else pub
+
+
+# Every parseable date has a digit; rejects "null", "None", "unknown"... before any parser runs
+_DATE_HINT_RE = re.compile(r"\d")
 
+# Recency buckets: days < threshold[i] -> multiplier[i], beyond the last -> multiplier[-1]
+_RECENCY_THRESHOLDS_DAYS = np.array([2 / 24, 3, 7, 30])
+_RECENCY_MULTIPLIERS = np.array([3.0, 1.5, 1.2, 1.0, 0.7])
 
-def _recency_multiplier(pub_date_str: str | None) -> float:
+
+def _days_since(pub_date_str: str | None, now: datetime) -> float:
+    """Age of the article in days, NaN if the date is missing or unparseable."""
+    pub_date_str = (pub_date_str or "").strip()
+    if not _DATE_HINT_RE.search(pub_date_str):
+        return float("nan")
+    pub_naive = _parse_pub_date(pub_date_str)
+    if pub_naive is None:
+        return float("nan")
+    return (now - pub_naive).total_seconds() / 86400
+
+
+def _recency_multipliers(pub_dates: list[str | None], now: datetime) -> np.ndarray:
     """
-    Computes recency multiplier (days-based, more gradual):
+    Recency multiplier for a batch of dates (days-based, more gradual):
     T < 2h   : 3.0 (Breaking News)
     T < 3d   : 1.5 (Fresh)
     T < 7d   : 1.2 (Recent)
     T < 30d  : 1.0 (Current)
     T > 30d  : 0.7 (Archive)
+    Unknown date: 1.0. Branchless bucket lookup via searchsorted.
     """
-    if not pub_date_str or not pub_date_str.strip():
-        return 1.0
-    try:
-        pub = date_parser.parse(pub_date_str)
-        pub_naive = pub.replace(tzinfo=None) if pub.tzinfo else pub
-        delta = datetime.now() - pub_naive
-        days = delta.total_seconds() / 86400
-        if days < 2 / 24:  # < 2h
-            return 3.0
-        if days < 3:
-            return 1.5
-        if days < 7:
-            return 1.2
-        if days < 30:
-            return 1.0
-        return 0.7
-    except (ValueError, TypeError):
-        return 1.0
-
-
-def _get_risk_multiplier(subject: str) -> float:
-    """Returns risk multiplier for subject (1.0 default)."""
-    return SUBJECT_RISK_MULTIPLIERS.get(subject.strip().lower(), 1.0)
+    days = np.fromiter((_days_since(d, now) for d in pub_dates), dtype=np.float64, count=len(pub_dates))
+    mults = _RECENCY_MULTIPLIERS[np.searchsorted(_RECENCY_THRESHOLDS_DAYS, days, side="right")]
+    return np.where(np.isnan(days), 1.0, mults)
+
+
+# Lookup tables for the vectorized score: key -> row index, last row = default
+_RISK_INDEX = {k: i for i, k in enumerate(SUBJECT_RISK_MULTIPLIERS)}
+_RISK_LUT = np.array([*SUBJECT_RISK_MULTIPLIERS.values(), 1.0])
+_SENTIMENT_INDEX = {k: i for i, k in enumerate(SENTIMENT_WEIGHTS)}
+_SENTIMENT_LUT = np.array([*SENTIMENT_WEIGHTS.values(), 0.5])
 
 
 # Noise patterns that often appear in off-topic search results
@@ -146,45 +259,73 @@ _TITLE_BLACKLIST = (
     "daily digest",
 )
 
+# Title noise in one case-insensitive scan; the matching group names the reason
+_TITLE_NOISE_RE = re.compile(
+    f"(?P<blacklist>{'|'.join(map(re.escape, _TITLE_BLACKLIST))})"
+    f"|(?P<newsletter>{'|'.join(map(re.escape, _NEWSLETTER_TITLE_PATTERNS))})",
+    re.IGNORECASE,
+)
+_TITLE_NOISE_LABELS = {"blacklist": "validation", "newsletter": "newsletter/promo"}
+
+
+def _title_noise(title: str) -> str | None:
+    """Skip reason if the title matches a noise pattern (blacklist, newsletter/promo), else None."""
+    m = _TITLE_NOISE_RE.search(title)
+    return _TITLE_NOISE_LABELS[m.lastgroup] if m else None
+
+
+_NON_WORD_RE = re.compile(r"[\W_]+")
+
+
+def _normalize_name(text: str) -> str:
+    """Casefold, strip accents and punctuation (any script): "L’Oréal S.A." -> "l oreal s a"."""
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return _NON_WORD_RE.sub(" ", stripped).strip()
+
+
+# Normalized, space-padded name variants of the known companies, built once at import
+_ALIAS_VARIANTS: dict[str, tuple[str, ...]] = {
+    key: tuple(dict.fromkeys(f" {_normalize_name(name)} " for name in (key, *aliases)))
+    for key, aliases in _COMPANY_ALIASES.items()
+}
+
+
+@lru_cache(maxsize=256)
+def _company_name_variants(company_name: str) -> tuple[str, ...]:
+    """Name variants to look for in titles: precomputed aliases, else the normalized name."""
+    company_lower = company_name.lower()
+    if company_lower in _ALIAS_VARIANTS:
+        return _ALIAS_VARIANTS[company_lower]
+    normalized = _normalize_name(company_name)
+    return (f" {normalized} ",) if normalized else ()
+
 
 def _validate_result(article_title: str, company_name: str) -> bool:
     """
-    Pre-filter: reject articles that don't mention the company (or its aliases) or match known noise.
-    Saves Jina/Gemini calls for clearly irrelevant results.
+    Pre-filter: reject articles that don't mention the company (or its aliases).
+    Saves Jina/Gemini calls for clearly irrelevant results (noise titles: _title_noise).
+    Name matching is whole-word and tolerant of accents/punctuation
+    ("L’Oreal" matches "L'Oréal", "Total" does not match "totally").
     """
     if not article_title or not company_name:
         return False
-    title_lower = article_title.lower()
-    company_lower = company_name.lower()
+    variants = _company_name_variants(company_name)
+    if not variants:
+        # Name is all punctuation/symbols: plain substring test
+        return company_name.lower() in article_title.lower()
+    # At least one variant must appear in the title (as whole words)
+    title_norm = f" {_normalize_name(article_title)} "
+    return any(name in title_norm for name in variants)
 
-    # Build list of accepted name variants
-    names_to_check = [company_lower]
-    aliases = _COMPANY_ALIASES.get(company_lower, [])
-    names_to_check.extend(a.lower() for a in aliases)
 
-    # At least one variant must appear in the title
-    if not any(name in title_lower for name in names_to_check):
-        return False
-    # Blacklist noisy patterns
-    if any(word in title_lower for word in _TITLE_BLACKLIST):
-        return False
-    return True
+# Excerpt budget for the analysis prompt (~1500 chars of English text)
+EXCERPT_MAX_TOKENS = 400
 
+_ANALYZE_INSTRUCTIONS = """You are an expert in media analysis and crisis management.
 
-def _analyze_article_with_gemini(
-    title: str, content: str, url: str, company_name: str
-) -> ArticleScores | None:
-    """Calls Gemini to get summary, Authority and Severity."""
-    if not llm:
-        print("[AGENT 1] Gemini client not configured (GOOGLE_API_KEY missing).")
-        return None
-    structured_llm = llm.with_structured_output(ArticleScores)
-    prompt = """You are an expert in media analysis and crisis management.
-
-The company we are monitoring is: {company_name}
-
-For this article, provide:
-1. **is_substantive_article**: True ONLY if this is a real news article PRIMARILY about {company_name}. Set to False if: the article is about a different company (e.g. Alibaba when we search for Amazon), a newsletter signup page, promotional content, or mostly navigation/footer boilerplate (e.g. "Sign up for our newsletters", "Related Articles", "Subscribe and interact").
+You will be given the name of the company we are monitoring and one or more articles. For each article, provide:
+1. **is_substantive_article**: True ONLY if this is a real news article PRIMARILY about the monitored company. Set to False if: the article is about a different company (e.g. Alibaba when we search for Amazon), a newsletter signup page, promotional content, or mostly navigation/footer boilerplate (e.g. "Sign up for our newsletters", "Related Articles", "Subscribe and interact").
 2. **summary**: A concise summary in 1-3 sentences (max 300 chars). Get to the point.
 3. **subject**: Use the MOST SPECIFIC category. One of: security_fraud, legal_compliance, ethics_management, labor_relations, financial_performance, operational_incident, product_bug, customer_service
    - security_fraud: fraud, data breach, security flaw
@@ -201,53 +342,157 @@ For this article, provide:
 7. **sentiment**: One of: negative (critical/unfavorable), neutral (balanced/factual), positive (favorable/promotional)
 8. **sub_theme**: A short 2-6 word phrase for the SPECIFIC angle or focus of this article. INVENT a distinct sub-theme to differentiate it (e.g. "Layoff email blunder", "Mass job cuts scale", "CEO documentary backlash", "Employee communication mishap"). Use varied angles so articles don't all get the same sub_theme.
 
-Article:
-Title: {title}
-URL: {url}
-Excerpt: {content}
-
-Respond with is_substantive_article, summary, subject, sub_theme, author, authority_score, severity_score and sentiment.
-""".format(
-        company_name=company_name or "the company",
-        title=title[:200],
-        url=url,
-        content=(content or "")[:1500],
+Respond with ONLY JSON (no prose, no code fence), one object per article, e.g.:
+{"is_substantive_article": true, "summary": "...", "subject": "labor_relations", "sub_theme": "Mass job cuts scale", "author": "", "authority_score": 4, "severity_score": 2, "sentiment": "negative"}
+"""
+
+def _analyze_prompt(company_name: str, title: str, url: str, content: str) -> str:
+    """Static instructions + per-article part (f-string: no format-spec parsing per call)."""
+    return (
+        f"{_ANALYZE_INSTRUCTIONS}\n"
+        f"The company we are monitoring is: {company_name}\n\n"
+        f"Article:\nTitle: {title}\nURL: {url}\nExcerpt: {content}\n"
+    )
+
+
+def _analyze_batch_prompt(company_name: str, batch: list[dict]) -> str:
+    """Same static instructions; articles labeled [1]..[N], answer is a JSON array."""
+    parts = [
+        f"{_ANALYZE_INSTRUCTIONS}\n"
+        f"The company we are monitoring is: {company_name}\n"
+        f"Reply with a JSON array of exactly {len(batch)} objects, one per article, in order; "
+        'add "idx" to each object: the article number in brackets.\n'
+    ]
+    for i, r in enumerate(batch, 1):
+        parts.append(
+            f"\n[{i}]\nTitle: {(r.get('title') or '')[:200]}\nURL: {r.get('url', '')}\nExcerpt: {r['excerpt']}\n"
+        )
+    return "".join(parts)
+
+
+def _analyze_correction(fields: str) -> str:
+    """Follow-up appended to the prompt when the first answer fails validation."""
+    return f"\nYour previous answer was not valid ({fields}). Reply again with ONLY the JSON object.\n"
+
+_JSON_FENCE_RE = re.compile(r"^```(?:json)?\s*|\s*```$")
+
+
+def _parse_article_scores(text: str) -> tuple[ArticleScores | None, str]:
+    """
+    Parses and validates the raw JSON reply locally (pydantic-core, Rust).
+    Returns (scores, "") or (None, comma-separated names of the failing fields).
+    """
+    try:
+        return ArticleScores.model_validate_json(_JSON_FENCE_RE.sub("", text.strip())), ""
+    except ValidationError as e:
+        fields = {str(err["loc"][0]) if err["loc"] else "json" for err in e.errors()}
+        return None, ", ".join(sorted(fields))
+
+
+def _parse_batch_scores(text: str, expected: int) -> list[ArticleScores | None] | None:
+    """
+    Parses a JSON array reply into one entry per article (None where an item is
+    missing or fails validation). Items are matched by their "idx" when every item
+    carries a distinct valid one, else by position. None if the reply is unusable.
+    """
+    try:
+        items = orjson.loads(_JSON_FENCE_RE.sub("", text.strip()))
+    except orjson.JSONDecodeError:
+        return None
+    if not isinstance(items, list):
+        return None
+    idxs = [item.get("idx") if isinstance(item, dict) else None for item in items]
+    if all(type(i) is int and 1 <= i <= expected for i in idxs) and len(set(idxs)) == len(idxs):
+        by_number = dict(zip(idxs, items))
+    elif len(items) == expected:
+        by_number = dict(enumerate(items, 1))
+    else:
+        return None
+    scores: list[ArticleScores | None] = []
+    for number in range(1, expected + 1):
+        item = by_number.get(number)
+        try:
+            scores.append(ArticleScores.model_validate(item) if item is not None else None)
+        except ValidationError:
+            scores.append(None)
+    return scores
+
+
+async def _analyze_article_with_gemini(
+    title: str, excerpt: str, url: str, company_name: str
+) -> ArticleScores | None:
+    """
+    Calls Gemini to get summary, Authority and Severity.
+    `excerpt` is the content already cut to EXCERPT_MAX_TOKENS.
+    Plain text generation + local validation: the prompt carries a short example
+    instead of the full tool schema. One retry naming the invalid fields.
+    """
+    if not llm:
+        logger.warning("Gemini client not configured (GOOGLE_API_KEY missing).")
+        return None
+    prompt = _analyze_prompt(
+        company_name or "the company",
+        title[:200],
+        url,
+        excerpt,
     )
     try:
-        return structured_llm.invoke(prompt)
+        response = await loop_llm().ainvoke(prompt)
+        scores, bad_fields = _parse_article_scores(response.text)
+        if scores is None:
+            response = await loop_llm().ainvoke(prompt + _analyze_correction(bad_fields))
+            scores, bad_fields = _parse_article_scores(response.text)
+        if scores is None:
+            logger.warning("Invalid Gemini output for '%s...' (%s)", title[:50], bad_fields)
+        return scores
     except Exception as e:
-        print(f"[AGENT 1] Gemini error for '{title[:50]}...': {e}")
+        logger.warning("Gemini error for '%s...': %s", title[:50], e)
         return None
 
 
-def _cluster_articles_with_gemini(articles: list[dict], max_per_cluster: int = 3) -> list[dict] | None:
+_CLUSTER_INSTRUCTIONS = """You will be given news articles about the same company. Group them into thematic clusters where each cluster shares a meaningful crisis angle.
+
+Rules:
+- Every article must appear in exactly one cluster.
+- Give each cluster a short, specific 2-5 word title (e.g. "Layoff Email Blunder", "Mass Job Cuts Scale", "CEO Priorities Backlash").
+- Articles covering genuinely different angles should be in different clusters.
+
+Return the clusters with their titles and the article indices (0-based) they contain.
+"""
+
+
+def _cluster_prompt(numbered: str, n: int, max_per_cluster: int) -> str:
+    """Static instructions first (cacheable prefix), then the per-run counts and articles."""
+    return (
+        f"{_CLUSTER_INSTRUCTIONS}\n"
+        f"There are {n} articles. Maximum {max_per_cluster} articles per cluster.\n\n"
+        f"Articles:\n{numbered}\n"
+    )
+
+
+async def _cluster_articles_with_gemini(articles: list[dict], max_per_cluster: int = 3) -> list[dict] | None:
     """
     Single Gemini call: groups all articles into thematic clusters (max 3 per cluster).
-    Returns a list of {title, articles} dicts, or None on failure (caller falls back).
+    Expects articles sorted by exposure desc. Returns the clusters ranked by total
+    exposure, or None on failure (caller falls back).
     """
     if not llm or len(articles) <= 1:
         return None
 
-    structured_llm = llm.with_structured_output(ArticleClusteringResult)
     numbered = "\n".join(
         f"[{i}] {a.get('title', '')} — {(a.get('summary') or '')[:120]}"
         for i, a in enumerate(articles)
     )
     n = len(articles)
-    prompt = f"""You have {n} news articles about the same company. Group them into thematic clusters where each cluster shares a meaningful crisis angle.
-
-Rules:
-- Maximum {max_per_cluster} articles per cluster.
-- Every article must appear in exactly one cluster.
-- Give each cluster a short, specific 2-5 word title (e.g. "Layoff Email Blunder", "Mass Job Cuts Scale", "CEO Priorities Backlash").
-- Articles covering genuinely different angles should be in different clusters.
-
-Articles:
-{numbered}
-
-Return the clusters with their titles and the article indices (0-based) they contain."""
+    prompt = _cluster_prompt(numbered, n, max_per_cluster)
     try:
-        result = structured_llm.invoke(prompt)
+        key = content_key(str(max_per_cluster), numbered)
+        cached = cache_get("article_clusters", key)
+        if cached is not None:
+            result = ArticleClusteringResult.model_validate(cached)
+        else:
+            result = await _cluster_llm().ainvoke(prompt)
+            cache_set("article_clusters", key, result.model_dump(), ttl=ANALYSIS_CACHE_TTL_S)
         # Validate: every index appears exactly once
         seen = set()
         clusters_out = []
@@ -255,21 +500,282 @@ Return the clusters with their titles and the article indices (0-based) they con
             valid_idx = [i for i in cluster.article_indices if 0 <= i < n and i not in seen]
             seen.update(valid_idx)
             if valid_idx:
-                chunk_articles = [articles[i] for i in valid_idx]
-                top = max(chunk_articles, key=lambda x: x["exposure_score"])
-                clusters_out.append({
+                # Index order is exposure order: first article is the cluster's top one
+                chunk_articles = [articles[i] for i in sorted(valid_idx)]
+                total = sum(a["exposure_score"] for a in chunk_articles)
+                clusters_out.append((total, {
                     "subject": cluster.title.lower().replace(" ", "_")[:40],
                     "title": cluster.title,
-                    "summary": top["summary"],
+                    "summary": chunk_articles[0]["summary"],
                     "article_count": len(chunk_articles),
                     "articles": chunk_articles,
-                })
-        return clusters_out if clusters_out else None
+                }))
+        return _rank_subjects(clusters_out) if clusters_out else None
     except Exception as e:
-        print(f"[AGENT 1] Clustering error: {e}")
+        logger.warning("Clustering error: %s", e)
         return None
 
 
+# Max concurrent Gemini calls (batched or per-article)
+MAX_CONCURRENT_ARTICLES = 10
+# Articles per analysis call; accuracy degrades past a handful per prompt
+ANALYZE_BATCH_SIZE = 5
+# Tavily results per run. Every surviving article is returned (grouped by subject),
+# so there is no top-K to stop early on; keeping this <= ANALYZE_BATCH_SIZE means
+# Step B is a single Gemini call.
+MAX_SEARCH_RESULTS = 5
+# Analysis/clustering results are reused for identical inputs; expire so model
+# updates are picked up
+ANALYSIS_CACHE_TTL_S = 24 * 3600
+# Syndicated copies (AP/Reuters wire) share the body; hashing a bounded prefix is enough
+CONTENT_HASH_PREFIX_CHARS = 4096
+
+
+def _dedupe_results(raw_results: list[dict]) -> tuple[list[dict], int]:
+    """
+    Drops results already seen by canonical URL or by identical body (content hash),
+    before any Gemini call is spent on them. Returns (unique results, duplicates skipped).
+    """
+    seen_urls: set[str] = set()
+    seen_content: set[bytes] = set()
+    unique = []
+    for r in raw_results:
+        url = canonical_url(r.get("url") or "")
+        content = (r.get("content") or "")[:CONTENT_HASH_PREFIX_CHARS]
+        digest = hashlib.blake2b(content.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+        if (url and url in seen_urls) or (content and digest in seen_content):
+            logger.info("Skipped (duplicate): %s...", (r.get("title") or "")[:60])
+            continue
+        if url:
+            seen_urls.add(url)
+        if content:
+            seen_content.add(digest)
+        unique.append(r)
+    return unique, len(raw_results) - len(unique)
+
+
+def _passes_prefilter(r: dict, company_name: str) -> bool:
+    """Cheap checks before any Gemini spend: company mention, noise and newsletter titles."""
+    title = r.get("title", "")
+    if not _validate_result(title, company_name):
+        logger.info("Skipped (validation): %s...", title[:60])
+        return False
+    noise = _title_noise(title)
+    if noise:
+        logger.info("Skipped (%s): %s...", noise, title[:60])
+        return False
+    return True
+
+
+async def _analyze_batch(
+    batch: list[dict], company_name: str, sem: asyncio.Semaphore
+) -> list[ArticleScores | None]:
+    """
+    One Gemini call for the whole batch (shared instructions sent once).
+    Results are cached by (company, canonical URL, title), so articles seen in a
+    previous run are not re-analyzed within ANALYSIS_CACHE_TTL_S. Falls back to per-article calls for items the
+    batch reply does not cover with a valid object.
+    """
+    async def single(r: dict) -> ArticleScores | None:
+        async with sem:
+            return await _analyze_article_with_gemini(
+                r.get("title", ""), r["excerpt"], r.get("url", ""), company_name
+            )
+
+    # Keyed by article identity, not snippet: Tavily returns a different excerpt of
+    # the same article depending on the query, which would otherwise miss the cache
+    keys = [
+        content_key(company_name, canonical_url(r.get("url") or ""), (r.get("title") or "")[:200])
+        for r in batch
+    ]
+    scores: list[ArticleScores | None] = []
+    for key in keys:
+        cached = cache_get("article_scores", key)
+        scores.append(ArticleScores.model_validate(cached) if cached is not None else None)
+    pending = [i for i, sc in enumerate(scores) if sc is None]
+    fresh = set(pending)
+
+    if llm and len(pending) > 1:
+        sub = [batch[i] for i in pending]
+        batch_scores = None
+        try:
+            async with sem:
+                response = await loop_llm().ainvoke(
+                    _analyze_batch_prompt(company_name or "the company", sub)
+                )
+            batch_scores = _parse_batch_scores(response.text, len(sub))
+        except Exception as e:
+            logger.warning("Gemini batch error (%d articles): %s", len(sub), e)
+        if batch_scores is None:
+            logger.info("Batch reply unusable — analyzing %d articles one by one.", len(sub))
+        else:
+            for i, sc in zip(pending, batch_scores):
+                scores[i] = sc
+            pending = [i for i in pending if scores[i] is None]
+    if pending:
+        retried = await asyncio.gather(*(single(batch[i]) for i in pending))
+        for i, sc in zip(pending, retried):
+            scores[i] = sc
+
+    for i in fresh:
+        if scores[i] is not None:
+            cache_set("article_scores", keys[i], scores[i].model_dump(), ttl=ANALYSIS_CACHE_TTL_S)
+    return scores
+
+
+_SUBJECT_KEY_SET = frozenset(SUBJECT_KEYS)
+
+# Content kept on each article in the state: Agent 3 reads only the first 1500 chars
+CONTENT_KEEP_CHARS = 1500
+
+
+def _build_article(r: dict, scores: ArticleScores | None) -> Article | None:
+    """Article dict from a Tavily result and its Gemini scores; None if not substantive."""
+    title = r.get("title", "")
+    # Use Tavily content only (Jina disabled for speed — Tavily snippets are sufficient)
+    # Keep articles even if paywalled — we return the 5 most relevant regardless
+    content = r.get("content") or ""
+
+    if scores is None:
+        summary = content[:300] or title  # fallback
+        subject = "ethics_management"
+        sub_theme = None
+        author = ""
+        authority_score = 3
+        severity_score = 2
+        sentiment = "neutral"
+    elif not getattr(scores, "is_substantive_article", True):
+        logger.info("Skipped (not substantive): %s...", title[:60])
+        return None
+    else:
+        summary = (scores.summary or content or title)[:300]
+        subject = scores.subject if scores.subject in _SUBJECT_KEY_SET else "ethics_management"
+        sub_theme = (getattr(scores, "sub_theme", "") or "").strip()[:80] or None
+        author = (scores.author or "").strip()[:200]
+        authority_score = scores.authority_score
+        severity_score = scores.severity_score
+        sentiment = getattr(scores, "sentiment", "neutral") or "neutral"
+        sentiment = sentiment.lower().strip()
+        if sentiment not in SENTIMENT_WEIGHTS:
+            sentiment = "neutral"
+
+    return {
+        "title": title,
+        "summary": summary,
+        "url": r.get("url", ""),
+        "content": content[:CONTENT_KEEP_CHARS],
+        "pub_date": r.get("pub_date"),
+        "author": author,
+        "subject": subject,
+        "sub_theme": sub_theme,
+        "sentiment": sentiment,
+        "authority_score": authority_score,
+        "severity_score": severity_score,
+        # C, D: set by _score_and_rank over the whole batch
+        "recency_multiplier": 1.0,
+        "exposure_score": 0.0,
+    }
+
+
+async def _process_articles(raw_results: list[dict], company_name: str) -> list[Article]:
+    """
+    Step B: pre-filter, then Gemini analysis in batches of ANALYZE_BATCH_SIZE
+    (batches run concurrently, calls bounded by a semaphore). Keeps the Tavily
+    order; a batch that raises is logged and its articles keep fallback scores.
+    """
+    # Excerpt tokenized once per article, reused by the batch prompt and any single retry
+    candidates = [
+        {**r, "excerpt": trim_to_tokens(r.get("content") or "", EXCERPT_MAX_TOKENS)}
+        for r in raw_results
+        if _passes_prefilter(r, company_name)
+    ]
+    batches = [
+        candidates[i:i + ANALYZE_BATCH_SIZE]
+        for i in range(0, len(candidates), ANALYZE_BATCH_SIZE)
+    ]
+    sem = asyncio.Semaphore(MAX_CONCURRENT_ARTICLES)
+    results = await asyncio.gather(
+        *(_analyze_batch(b, company_name, sem) for b in batches),
+        return_exceptions=True,
+    )
+    articles = []
+    for batch, res in zip(batches, results):
+        if isinstance(res, BaseException):
+            logger.warning("Article batch failed (%d articles): %s", len(batch), res)
+            res = [None] * len(batch)
+        for r, scores in zip(batch, res):
+            article = _build_article(r, scores)
+            if article is not None:
+                articles.append(article)
+    return articles
+
+
+def _exposure_scores(articles: list[Article], recency_mult: np.ndarray) -> np.ndarray:
+    """
+    Exposure Score for a batch of articles, vectorized over SoA columns:
+    (Authority × Severity) × risk_mult × recency × sentiment_weight
+    (asymmetric sentiment: negative full, positive 0.1), rounded to 2 decimals.
+    """
+    n = len(articles)
+    authority = np.fromiter((a["authority_score"] for a in articles), dtype=np.float64, count=n)
+    severity = np.fromiter((a["severity_score"] for a in articles), dtype=np.float64, count=n)
+    risk_idx = np.fromiter(
+        (_RISK_INDEX.get(a["subject"], -1) for a in articles), dtype=np.intp, count=n
+    )
+    sentiment_idx = np.fromiter(
+        (_SENTIMENT_INDEX.get(a["sentiment"], -1) for a in articles), dtype=np.intp, count=n
+    )
+    risk_mult = _RISK_LUT.take(risk_idx)  # -1 -> default row (1.0)
+    sentiment_weight = _SENTIMENT_LUT.take(sentiment_idx)  # -1 -> default row (0.5)
+    return (authority * severity * risk_mult * recency_mult * sentiment_weight).round(2)
+
+
+def _score_and_rank(articles: list[Article], now: datetime) -> list[Article]:
+    """
+    Sets recency_multiplier (C) and exposure_score (D) on each article
+    and returns them sorted by score (desc, stable).
+    """
+    if not articles:
+        return articles
+    recency_mult = _recency_multipliers([a["pub_date"] for a in articles], now)
+    scores = _exposure_scores(articles, recency_mult)
+    for a, mult, score in zip(articles, recency_mult.tolist(), scores.tolist()):
+        a["recency_multiplier"] = mult
+        a["exposure_score"] = score
+    return [articles[i] for i in np.argsort(-scores, kind="stable")]
+
+
+def _rank_subjects(totals_and_subjects: list[tuple[float, dict]]) -> list[dict]:
+    """Subjects sorted by total exposure (sum of scores in group), highest first."""
+    totals_and_subjects.sort(key=itemgetter(0), reverse=True)
+    return [s for _, s in totals_and_subjects]
+
+
+def _group_by_subject(articles: list[dict]) -> list[dict]:
+    """
+    Groups articles by subject in a single pass (running total exposure per subject),
+    then sorts the subjects once. Expects articles sorted by exposure desc
+    (_score_and_rank), so each group's first article is its top one.
+    """
+    groups: defaultdict[str, list[dict]] = defaultdict(list)
+    totals: defaultdict[str, float] = defaultdict(float)
+    for a in articles:
+        sub = a.get("subject", "other")
+        groups[sub].append(a)
+        totals[sub] += a["exposure_score"]
+
+    return _rank_subjects([
+        (totals[sub], {
+            "subject": sub,
+            "title": SUBJECT_DISPLAY_NAMES.get(sub, sub.replace("_", " ").title()),
+            "summary": sub_articles[0]["summary"],
+            "article_count": len(sub_articles),
+            "articles": sub_articles,
+        })
+        for sub, sub_articles in groups.items()
+    ])
+
+
 # Step IDs for real-time UI sync (must match frontend AGENT_STEPS order)
 STEP_INITIALIZING = "initializing"
 STEP_SCANNING = "scanning_news"
@@ -280,12 +786,17 @@ STEP_COMPILING = "compiling_results"
 
 
 def watcher_node(state: GraphState) -> dict:
+    """Sync entry point (API threads, scripts): runs watcher_node_async on the shared background loop."""
+    return run_sync(watcher_node_async(state))
+
+
+async def watcher_node_async(state: GraphState) -> dict:
     """
     Agent 1: collects articles (Tavily), LLM analysis (Gemini), Exposure scoring.
     Formula: Exposure Score = (Authority × Severity) × Recency Multiplier.
     Calls on_step(step_id) when provided in state for real-time UI sync.
+    Search, analysis and clustering all run on one event loop.
     """
-    t0 = time.time()
     company_name = state.get("company_name", "")
     customer_id = state.get("customer_id") or _derive_customer_id(company_name)
     crisis_id = str(uuid.uuid4())
@@ -301,131 +812,44 @@ def watcher_node(state: GraphState) -> dict:
     _emit(STEP_INITIALIZING)
 
     # --- Step A: Tavily search ---
-    raw_results = search_news(company_name, max_results=5)
+    raw_results = await search_news_async(company_name, max_results=MAX_SEARCH_RESULTS)
     _emit(STEP_SCANNING)
     if not raw_results:
-        print("[AGENT 1] No articles found by Tavily.")
+        logger.info("No articles found by Tavily.")
         _emit(STEP_COMPILING)
         return {
             "customer_id": customer_id,
             "crisis_id": crisis_id,
             "articles": [],
             "subjects": [],
+            "duplicates_skipped": 0,
         }
 
+    raw_results, duplicates_skipped = _dedupe_results(raw_results)
+
     # --- Étapes B, C, D : Analyse et scoring pour chaque article ---
     _emit(STEP_ANALYZING)
-    articles = []
-    for r in raw_results:
-        title = r.get("title", "")
-        url = r.get("url", "")
-        pub_date = r.get("pub_date")
-
-        # Pre-filter: skip articles that don't mention the company or match noise patterns
-        if not _validate_result(title, company_name):
-            print(f"[AGENT 1] Skipped (validation): {title[:60]}...")
-            continue
-
-        # Use Tavily content only (Jina disabled for speed — Tavily snippets are sufficient)
-        content = r.get("content", "") or ""
-
-        # Keep articles even if paywalled — we return the 5 most relevant regardless
-
-        # Skip obvious newsletter/promo pages before calling Gemini
-        _title_lower = title.lower()
-        if any(x in _title_lower for x in ("sign up for", "newsletter", "get our newsletter", "subscribe to our")):
-            print(f"[AGENT 1] Skipped (newsletter/promo): {title[:60]}...")
-            continue
-
-        # B: Gemini (is_substantive + summary + subject + author + Authority + Severity)
-        scores = _analyze_article_with_gemini(title, content, url, company_name)
-        if scores is None:
-            summary = (content or "")[:300] if content else title  # fallback
-            subject = "ethics_management"
-            sub_theme = None
-            author = ""
-            authority_score = 3
-            severity_score = 2
-            sentiment = "neutral"
-        elif not getattr(scores, "is_substantive_article", True):
-            print(f"[AGENT 1] Skipped (not substantive): {title[:60]}...")
-            continue
-        else:
-            summary = (scores.summary or content or title)[:300]
-            subject = scores.subject if scores.subject in SUBJECT_KEYS else "ethics_management"
-            sub_theme = (getattr(scores, "sub_theme", "") or "").strip()[:80] or None
-            author = (scores.author or "").strip()[:200]
-            authority_score = scores.authority_score
-            severity_score = scores.severity_score
-            sentiment = getattr(scores, "sentiment", "neutral") or "neutral"
-            sentiment = sentiment.lower().strip()
-            if sentiment not in SENTIMENT_WEIGHTS:
-                sentiment = "neutral"
-
-        # C: Recency Multiplier (days-based)
-        recency_mult = _recency_multiplier(pub_date)
-
-        # D: Exposure Score formula
-        # base × risk_mult × recency × sentiment_weight (asymmetric: negative full, positive 0.1)
-        risk_mult = _get_risk_multiplier(subject)
-        sentiment_weight = SENTIMENT_WEIGHTS.get(sentiment, 0.5)
-        exposure_score = (
-            (authority_score * severity_score)
-            * risk_mult
-            * recency_mult
-            * sentiment_weight
-        )
-
-        article = {
-            "title": title,
-            "summary": summary,
-            "url": url,
-            "content": content,
-            "pub_date": pub_date,
-            "author": author,
-            "subject": subject,
-            "sub_theme": sub_theme,
-            "sentiment": sentiment,
-            "authority_score": authority_score,
-            "severity_score": severity_score,
-            "recency_multiplier": recency_mult,
-            "exposure_score": round(exposure_score, 2),
-        }
-        articles.append(article)
-        print(f"[AGENT 1] Article found: {title} | Score: {article['exposure_score']}")
+    articles = await _process_articles(raw_results, company_name)
 
     _emit(STEP_CROSS_REFERENCING)
 
-    # Sort by Exposure Score descending
-    articles.sort(key=lambda a: a["exposure_score"], reverse=True)
+    # C, D: Recency + Exposure Score for the whole batch, sorted descending
+    articles = _score_and_rank(articles, datetime.now())
+    if articles:
+        # One record for the batch: lines stay together under concurrent runs
+        logger.info(
+            "Articles found (%d):\n%s",
+            len(articles),
+            "\n".join(f"  {a['title']} | Score: {a['exposure_score']:.2f}" for a in articles),
+        )
     _emit(STEP_EVALUATING)
 
     # Cluster articles with Gemini (single call, max 3 per cluster)
-    subjects = _cluster_articles_with_gemini(articles, max_per_cluster=3) or []
+    subjects = await _cluster_articles_with_gemini(articles, max_per_cluster=3) or []
 
     # Fallback: if clustering failed, group by subject
     if not subjects:
-        subjects_map: dict[str, list[dict]] = {}
-        for a in articles:
-            sub = a.get("subject", "other")
-            if sub not in subjects_map:
-                subjects_map[sub] = []
-            subjects_map[sub].append(a)
-        for sub, sub_articles in subjects_map.items():
-            top = max(sub_articles, key=lambda x: x["exposure_score"])
-            subjects.append({
-                "subject": sub,
-                "title": SUBJECT_DISPLAY_NAMES.get(sub, sub.replace("_", " ").title()),
-                "summary": top["summary"],
-                "article_count": len(sub_articles),
-                "articles": sub_articles,
-            })
-
-    # Sort subjects by total exposure (sum of scores in group)
-    subjects.sort(
-        key=lambda s: sum(a["exposure_score"] for a in s["articles"]),
-        reverse=True,
-    )
+        subjects = _group_by_subject(articles)
 
     _emit(STEP_COMPILING)
     return {
@@ -433,9 +857,14 @@ def watcher_node(state: GraphState) -> dict:
         "crisis_id": crisis_id,
         "articles": articles,
         "subjects": subjects,
+        "duplicates_skipped": duplicates_skipped,
     }
 
 
+_CUSTOMER_ID_TABLE = str.maketrans({" ": "_", "-": "_"})
+
+
+@lru_cache(maxsize=256)
 def _derive_customer_id(company_name: str) -> str:
     """Derives external_customer_id if not provided."""
-    return (company_name or "unknown").lower().replace(" ", "_").replace("-", "_")[:64]
+    return (company_name or "unknown").lower().translate(_CUSTOMER_ID_TABLE)[:64]
@@ -3,60 +3,125 @@ LangGraph Node: Agent 2 — The Historical PR Strategist.
 
 3-phase pipeline using Gemini with Google Search Grounding:
   2.1  Input Builder         — Extracts rich crisis context from Agent 1 state
-  2.2  Grounded Research     — 3 Gemini calls with Google Search (crises, strategies, outcomes)
-  2.3  Extract & Verify      — LLM Pro structures the cases, Flash verifies against sources
+  2.2  Grounded Research     — 2 parallel Gemini calls with Google Search (A: crises + strategies, B: outcomes)
+  2.3  Extract & Verify      — LLM Pro structures the cases and self-checks them against sources
 
 Replaces the old Tavily-based pipeline with Gemini's native search grounding,
 giving the LLM direct access to real-time web results for higher relevance.
 
-Emits a Paid.ai signal at the end (historical_precedents_extracted).
+Emits a Paid.ai signal at the end (historical_precedents_extracted), sent in the
+background so the node returns without waiting on Paid.ai.
 """
 from __future__ import annotations
 
+import asyncio
+import base64
+import copy
+import os
+import re
+import threading
 import time
 import traceback
-from collections import Counter
-from concurrent.futures import ThreadPoolExecutor
-from typing import Any
+import weakref
+from collections import Counter, deque
+from itertools import islice
+from typing import Any, Callable
+from urllib.parse import quote_plus
 
+import numpy as np
 from google.genai import types as genai_types
 from langchain_google_genai import ChatGoogleGenerativeAI
 
 from src.graph.state import GraphState
-from src.clients.llm_client import llm_flash, llm_pro, GOOGLE_API_KEY, GOOGLE_API_KEY1
+from src.clients.http import SDK_CLIENT_ARGS, loop_local, run_sync
+from src.clients.llm_batch import (
+    DONE_STATES, cancel_batch, get_batch_status, retrieve_batch_results, submit_batch,
+)
+from src.clients.llm_client import embeddings, llm_pro, loop_llm, GOOGLE_API_KEY, GOOGLE_API_KEY1
 from src.shared.types import (
     Agent1Output, Agent2Output, HistoricalCrisis, ArticleDetail,
     SUBJECT_DISPLAY_NAMES,
 )
-from src.utils.paid_helpers import emit_agent2_signal
+from src.utils.llm_cache import cache_get, cache_set, content_key
+from src.utils.paid_helpers import emit_agent2_signal, emit_in_background
+from src.utils.retry import MAX_RETRIES, is_retryable, next_delay
+from src.utils.tokens import trim_to_tokens
+
+
+MAX_LLM_RETRIES = MAX_RETRIES
+GROUNDED_MODEL = "gemini-2.5-flash"
+# Grounded results reflect current news: cache them shorter than the 24h default
+RESEARCH_CACHE_TTL_S = 6 * 3600
+# Upper bound for both grounded searches (retries included) before degrading
+GROUNDED_SEARCH_TIMEOUT_S = 120
+# Gemini grounding limits: concurrent searches per event loop, searches started per minute (process)
+GROUNDED_MAX_CONCURRENCY = 2
+GROUNDED_CALLS_PER_MIN = 60
+GROUNDED_SEARCH_COST_EUR = 0.035
+EXTRACTION_COST_EUR = 0.005
+# Batch mode (backfills): half-price extraction, polled until done or the deadline
+BATCH_POLL_S = 30
+BATCH_TIMEOUT_S = 3600
+GOOGLE_SEARCH_TOOL = genai_types.Tool(google_search=genai_types.GoogleSearch())
 
 
-MAX_LLM_RETRIES = 3
-GOOGLE_SEARCH_TOOL = genai_types.Tool(google_search=genai_types.GoogleSearch())
+# Structured-output bindings are built once per event loop: extraction runs on the API
+# server's loop and on run_sync's background loop (graph nodes, worker threads), and an
+# async Gemini client cannot cross loops.
+def _extractor_llm():
+    """Pro extractor for the running loop."""
+    return loop_local("agent2_extractor", lambda: loop_llm().with_structured_output(Agent2Output))
+
+
+def _fallback_extractor_llm():
+    """Same extractor on GOOGLE_API_KEY1 (independent quota), used only when the primary key keeps failing."""
+    return loop_local(
+        "agent2_extractor_fallback",
+        lambda: loop_llm(GOOGLE_API_KEY1).with_structured_output(Agent2Output),
+    )
 
 
 # ---------------------------------------------------------------------------
 # Retry helper
 # ---------------------------------------------------------------------------
 
-def _retry_llm(fn, retries: int = MAX_LLM_RETRIES):
-    """Call fn() up to `retries` times, returning the result or raising on final failure."""
+async def _retry_llm_async(fn, retries: int = MAX_LLM_RETRIES):
+    """
+    Await fn() up to `retries` times, returning the result or raising on final failure.
+    Client errors that cannot succeed (400/401/403/404) raise at once; waits honor
+    the server's retry delay, else use jittered backoff (src.utils.retry).
+    """
     last_err = None
+    delay = 0.0
     for attempt in range(1, retries + 1):
         try:
-            return fn()
+            return await fn()
         except Exception as e:
             last_err = e
             print(f"[AGENT 2] LLM call failed (attempt {attempt}/{retries}): {e}")
+            if not is_retryable(e):
+                break
             if attempt < retries:
-                time.sleep(2 ** attempt)
-    raise RuntimeError(f"LLM call failed after {retries} attempts: {last_err}")
+                delay = next_delay(e, delay)
+                await asyncio.sleep(delay)
+    raise RuntimeError(f"LLM call failed after {attempt} attempts: {last_err}")
 
 
 # ---------------------------------------------------------------------------
 # Step 2.1 — Build rich Agent1Output from GraphState
 # ---------------------------------------------------------------------------
 
+# Crisis summary budgets, sized once when Agent1Output is built:
+# the searches get a short variant, the extractor the full one
+SEARCH_SUMMARY_MAX_TOKENS = 256
+EXTRACTOR_SUMMARY_MAX_TOKENS = 2048
+
+
+def _summary_variants(summary: str) -> dict[str, str]:
+    """crisis_summary / crisis_summary_short fields, cut by tokens (not characters)."""
+    full = trim_to_tokens(summary, EXTRACTOR_SUMMARY_MAX_TOKENS)
+    return {"crisis_summary": full, "crisis_summary_short": trim_to_tokens(full, SEARCH_SUMMARY_MAX_TOKENS)}
+
 def _build_agent1_output(state: GraphState) -> Agent1Output:
     """
     Build a rich Agent1Output from the full GraphState.
@@ -74,35 +139,38 @@ def _build_agent1_output(state: GraphState) -> Agent1Output:
             articles=[],
         )
 
-    max_severity = max(a.get("severity_score", 1) for a in articles)
-
-    subjects = [a.get("subject", "") for a in articles if a.get("subject")]
-    if subjects:
-        most_common_subject = Counter(subjects).most_common(1)[0][0]
-        category = SUBJECT_DISPLAY_NAMES.get(most_common_subject, most_common_subject)
-    else:
-        category = _severity_to_category(max_severity)
-
+    # One pass: running max severity, subject histogram, per-article detail
+    max_severity = 1
+    subject_counts: Counter[str] = Counter()
     article_details: list[ArticleDetail] = []
     for a in articles:
+        severity = a.get("severity_score", 1)
+        if severity > max_severity:
+            max_severity = severity
+        subject = a.get("subject", "")
+        if subject:
+            subject_counts[subject] += 1
         article_details.append(ArticleDetail(
             title=a.get("title", ""),
             summary=a.get("summary") or a.get("title", ""),
-            severity_score=a.get("severity_score", 1),
-            subject=a.get("subject", ""),
+            severity_score=severity,
+            subject=subject,
         ))
 
-    structured_summary_parts = []
-    for i, ad in enumerate(article_details[:10], 1):
-        subj_display = SUBJECT_DISPLAY_NAMES.get(ad.subject, ad.subject)
-        structured_summary_parts.append(
-            f"Article {i} [{subj_display}, severity {ad.severity_score}/5]: {ad.summary}"
-        )
-    crisis_summary = "\n".join(structured_summary_parts)
+    display_name = SUBJECT_DISPLAY_NAMES.get
+    if subject_counts:
+        most_common_subject = subject_counts.most_common(1)[0][0]
+        category = display_name(most_common_subject, most_common_subject)
+    else:
+        category = _severity_to_category(max_severity)
 
+    structured_summary_parts = [
+        f"Article {i} [{display_name(ad.subject, ad.subject)}, severity {ad.severity_score}/5]: {ad.summary}"
+        for i, ad in enumerate(islice(article_details, 10), 1)
+    ]
     return Agent1Output(
         company_name=company_name,
-        crisis_summary=crisis_summary,
+        **_summary_variants("\n".join(structured_summary_parts)),
         severity_score=max_severity,
         primary_threat_category=category,
         articles=article_details,
@@ -120,22 +188,17 @@ def _severity_to_category(severity: int) -> str:
 
 
 # ---------------------------------------------------------------------------
-# Step 2.2 — Three Grounded Gemini Searches
+# Step 2.2 — Two Grounded Gemini Searches (A and B, in parallel)
 # ---------------------------------------------------------------------------
 
-SEARCH_A_PROMPT = """\
+# Prompts put the static instructions first and the per-crisis context last:
+# Gemini's implicit prefix cache only reuses a byte-identical leading block.
+# (Explicit context caching needs >= 1024 prefix tokens; these are ~300.)
+SEARCH_A_INSTRUCTIONS = """\
 You are a corporate crisis research analyst with access to Google Search.
 
-CURRENT CRISIS:
-- Company: {company_name}
-- Category: {primary_threat_category}
-- Severity: {severity_score}/5
-
-KEY ARTICLES FROM TODAY'S NEWS:
-{crisis_summary}
-
 YOUR TASK: Search for 5-8 SIMILAR historical corporate crises at OTHER companies \
-(NOT {company_name}), AND the PR/communication strategy each company deployed.
+than the one in the current crisis below, AND the PR/communication strategy each company deployed.
 
 For each crisis, provide:
 - Company name and year
@@ -145,24 +208,34 @@ For each crisis, provide:
 - Any notable quotes or public statements
 
 SEARCH STRATEGY:
-- Search for crises matching the SAME specific issues described in the articles above
+- Search for crises matching the SAME specific issues described in the articles below
 - Look for well-documented cases from HBR, WSJ, Forbes, Reuters, Bloomberg
 - Include both famous cases AND lesser-known but highly relevant ones
 - Be SPECIFIC: "CEO X appeared on NBC within 24h" not just "issued an apology"
 
-Be thorough. Search multiple times with different keywords. Cite your sources."""
+Be thorough. Search multiple times with different keywords. Cite your sources.
 
-SEARCH_B_PROMPT = """\
-You are a financial analyst specializing in crisis aftermath with access to Google Search.
+---
 
-CURRENT CRISIS CONTEXT:
-- Company: {company_name}
-- Category: {primary_threat_category}
-- Severity: {severity_score}/5
-- Summary: {crisis_summary}
+"""
+
+
+def _search_a_prompt(ctx: dict) -> str:
+    """Static instructions + per-crisis context (f-string: no format-spec parsing per call)."""
+    return (
+        f"{SEARCH_A_INSTRUCTIONS}"
+        f"CURRENT CRISIS (exclude {ctx['company_name']} itself from the results):\n"
+        f"- Company: {ctx['company_name']}\n"
+        f"- Category: {ctx['primary_threat_category']}\n"
+        f"- Severity: {ctx['severity_score']}/5\n\n"
+        f"KEY ARTICLES FROM TODAY'S NEWS:\n{ctx['crisis_summary']}"
+    )
+
+SEARCH_B_INSTRUCTIONS = """\
+You are a financial analyst specializing in crisis aftermath with access to Google Search.
 
 YOUR TASK: Search for MEASURABLE OUTCOMES of historical corporate crises similar to \
-the one described above. Focus on companies that faced {primary_threat_category} issues.
+the one described below. Focus on companies that faced issues of the same category.
 
 For each case you find, provide:
 - Company name and year of the crisis
@@ -175,11 +248,31 @@ For each case you find, provide:
 
 Search for financial reports, earnings calls, analyst notes, and retrospective articles.
 Prioritize QUANTITATIVE data over qualitative opinions.
-Be thorough. Cite your sources."""
+Be thorough. Cite your sources.
+
+---
+
+"""
+
+
+def _search_b_prompt(ctx: dict) -> str:
+    """Static instructions + per-crisis context."""
+    return (
+        f"{SEARCH_B_INSTRUCTIONS}"
+        f"CURRENT CRISIS CONTEXT:\n"
+        f"- Company: {ctx['company_name']}\n"
+        f"- Category: {ctx['primary_threat_category']}\n"
+        f"- Severity: {ctx['severity_score']}/5\n"
+        f"- Summary: {ctx['crisis_summary']}"
+    )
 
 
 def _extract_grounding_sources(response) -> list[dict]:
-    """Pull source URLs and titles from Gemini's grounding metadata."""
+    """
+    Pull source URLs and titles from Gemini's grounding metadata.
+    One source per site: grounding URIs are per-chunk redirects, so several
+    chunks of one page carry different URLs but the same domain.
+    """
     sources = []
     seen_domains: set[str] = set()
     try:
@@ -192,116 +285,183 @@ def _extract_grounding_sources(response) -> list[dict]:
             web = chunk.get("web") or {}
             url = web.get("uri", "")
             title = web.get("title", "") or web.get("domain", "")
-            if url and title not in seen_domains:
-                seen_domains.add(title)
-                sources.append({"url": url, "title": title})
+            domain = (web.get("domain") or title).strip().lower()
+            if url and domain not in seen_domains:
+                seen_domains.add(domain)
+                sources.append({"url": url, "title": title, "domain": domain})
     except Exception:
         pass
     return sources
 
 
-def _grounded_search(prompt: str, label: str, api_key: str | None = None) -> tuple[str, list[dict]]:
+def _source_site(src: dict) -> str:
+    """Dedup key across searches: the site (redirect URLs are unique per citation)."""
+    return (src.get("domain") or src.get("title") or src["url"]).strip().lower()
+
+
+def _grounded_llm(api_key: str):
+    """One grounded client per (API key, event loop): kept warm across calls in a loop, while
+    its async httpx client never crosses into another loop (API server loop vs run_sync's loop).
+    The Google Search tool is bound here, so its schema is converted once, not per call."""
+    return loop_local(("agent2_grounded", api_key), lambda: ChatGoogleGenerativeAI(
+        model=GROUNDED_MODEL,
+        google_api_key=api_key,
+        temperature=0.1,
+        client_args=SDK_CLIENT_ARGS,
+    ).bind_tools([GOOGLE_SEARCH_TOOL]))
+
+
+_grounded_slots: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+    weakref.WeakKeyDictionary()
+)
+_rate_lock = threading.Lock()
+_recent_calls: deque[float] = deque()  # start times of grounded calls in the last minute
+
+
+def _grounded_semaphore() -> asyncio.Semaphore:
+    """GROUNDED_MAX_CONCURRENCY slots for the running loop (asyncio primitives cannot cross loops)."""
+    loop = asyncio.get_running_loop()
+    sem = _grounded_slots.get(loop)
+    if sem is None:
+        sem = _grounded_slots[loop] = asyncio.Semaphore(GROUNDED_MAX_CONCURRENCY)
+    return sem
+
+
+async def _await_rate_slot() -> None:
+    """Sliding 60s window: waits until fewer than GROUNDED_CALLS_PER_MIN calls started in it."""
+    while True:
+        with _rate_lock:
+            now = time.monotonic()
+            while _recent_calls and now - _recent_calls[0] >= 60:
+                _recent_calls.popleft()
+            if len(_recent_calls) < GROUNDED_CALLS_PER_MIN:
+                _recent_calls.append(now)
+                return
+            wait = 60 - (now - _recent_calls[0])
+        await asyncio.sleep(wait)
+
+
+async def _grounded_search(prompt: str, label: str, api_key: str | None = None) -> tuple[str, list[dict], float]:
     """Execute a single Gemini call with Google Search grounding.
-    Returns (text_content, list_of_sources).
-    Uses api_key if provided, otherwise falls back to GOOGLE_API_KEY."""
+    Returns (text_content, list_of_sources, cost_eur).
+    Uses api_key if provided, otherwise falls back to GOOGLE_API_KEY.
+    Cached on (model, prompt) for RESEARCH_CACHE_TTL_S: repeat crises skip the call (cost 0)."""
     key = api_key or GOOGLE_API_KEY
     if not key:
         raise RuntimeError("GOOGLE_API_KEY missing — cannot run grounded search.")
 
-    llm_grounded = ChatGoogleGenerativeAI(
-        model="gemini-2.5-flash",
-        google_api_key=key,
-        temperature=0.1,
-    )
+    cache_key = content_key(GROUNDED_MODEL, prompt)
+    cached = cache_get("grounded_search", cache_key)
+    if cached is not None:
+        print(f"[AGENT 2]   {label}: cache hit")
+        text, sources = cached
+        return text, [dict(s) for s in sources], 0.0  # callers tag sources in place
+
+    llm_grounded = _grounded_llm(key)
 
-    def call():
-        return llm_grounded.invoke(prompt, tools=[GOOGLE_SEARCH_TOOL])
+    async def call():
+        await _await_rate_slot()
+        return await llm_grounded.ainvoke(prompt)
 
     t0 = time.time()
     print(f"[AGENT 2]   Running grounded search: {label}...")
-    result = _retry_llm(call)
+    async with _grounded_semaphore():
+        result = await _retry_llm_async(call)
     text = result.content
     sources = _extract_grounding_sources(result)
     elapsed = time.time() - t0
     print(f"[AGENT 2]   {label}: {len(text)} chars, {len(sources)} sources in {elapsed:.1f}s")
-    return text, sources
+    if text:  # an empty answer is retried on the next run, not cached
+        cache_set("grounded_search", cache_key, [text, sources], ttl=RESEARCH_CACHE_TTL_S)
+    return text, [dict(s) for s in sources], GROUNDED_SEARCH_COST_EUR
+
 
+def _run_grounded_research(agent1: Agent1Output) -> tuple[dict[str, str], list[dict], float]:
+    """Sync entry point for step 2.2 (runs the async research on the shared background loop)."""
+    return run_sync(_run_grounded_research_async(agent1))
 
-def _run_grounded_research(agent1: Agent1Output) -> tuple[dict[str, str], list[dict]]:
+
+async def _run_grounded_research_async(agent1: Agent1Output) -> tuple[dict[str, str], list[dict], float]:
     """
     Step 2.2: Two fully PARALLEL grounded searches on different API keys.
     Search A (crises + strategies) on KEY 1, Search B (outcomes) on KEY 2.
+    Returns (research, sources, cost_eur); cached searches cost nothing.
     """
     t0 = time.time()
     crisis_ctx = dict(
         company_name=agent1.company_name,
         primary_threat_category=agent1.primary_threat_category,
         severity_score=agent1.severity_score,
-        crisis_summary=agent1.crisis_summary[:1000],
+        crisis_summary=agent1.crisis_summary_short or agent1.crisis_summary,
     )
 
-    all_sources: list[dict] = []
+    research_by_phase = {"crises_strategies": "", "outcomes": ""}
+    sources_by_phase: dict[str, list[dict]] = {"crises_strategies": [], "outcomes": []}
+    cost_by_phase = {"crises_strategies": 0.0, "outcomes": 0.0}
 
-    with ThreadPoolExecutor(max_workers=2) as pool:
-        future_a = pool.submit(
-            _grounded_search,
-            SEARCH_A_PROMPT.format(**crisis_ctx),
+    # Each search is post-processed as soon as it lands; a failed or hung search
+    # leaves its phase empty instead of sinking the other one's results.
+    async def run_search(phase: str, prompt: str, label: str, api_key: str | None) -> None:
+        try:
+            text, phase_sources, cost_by_phase[phase] = await _grounded_search(prompt, label, api_key)
+        except Exception as e:
+            print(f"[AGENT 2]   Search '{phase}' failed: {e}")
+            return
+        for src in phase_sources:
+            src["phase"] = phase
+        sources_by_phase[phase] = phase_sources
+        research_by_phase[phase] = text
+
+    tasks = {
+        asyncio.create_task(run_search(
+            "crises_strategies",
+            _search_a_prompt(crisis_ctx),
             "Search A — Crises & Strategies",
             GOOGLE_API_KEY,
-        )
-        future_b = pool.submit(
-            _grounded_search,
-            SEARCH_B_PROMPT.format(**crisis_ctx),
+        )): "crises_strategies",
+        asyncio.create_task(run_search(
+            "outcomes",
+            _search_b_prompt(crisis_ctx),
             "Search B — Outcomes & Financials",
             GOOGLE_API_KEY1,
-        )
-
-        search_a_text, search_a_sources = future_a.result()
-        search_b_text, search_b_sources = future_b.result()
-
-    for s in search_a_sources:
-        s["phase"] = "crises_strategies"
-    all_sources.extend(search_a_sources)
-    for s in search_b_sources:
-        s["phase"] = "outcomes"
-    all_sources.extend(search_b_sources)
-
+        )): "outcomes",
+    }
+    _, pending = await asyncio.wait(tasks, timeout=GROUNDED_SEARCH_TIMEOUT_S)
+    if pending:
+        print(f"[AGENT 2]   Search timed out after {GROUNDED_SEARCH_TIMEOUT_S}s: {', '.join(tasks[t] for t in pending)}")
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    # Search A's sources first, as before, whichever search finished first; one per site
     seen: set[str] = set()
     unique_sources: list[dict] = []
-    for s in all_sources:
-        if s["url"] not in seen:
-            seen.add(s["url"])
+    for s in sources_by_phase["crises_strategies"] + sources_by_phase["outcomes"]:
+        key = _source_site(s)
+        if key not in seen:
+            seen.add(key)
             unique_sources.append(s)
 
     print(f"[AGENT 2]   Total unique sources: {len(unique_sources)} | Research phase: {time.time() - t0:.1f}s")
 
     research = {
-        "crises": search_a_text,
-        "strategies": search_a_text,
-        "outcomes": search_b_text,
+        "crises": research_by_phase["crises_strategies"],
+        "strategies": research_by_phase["crises_strategies"],
+        "outcomes": research_by_phase["outcomes"],
     }
-    return research, unique_sources
+    return research, unique_sources, sum(cost_by_phase.values())
 
 
 # ---------------------------------------------------------------------------
 # Step 2.3 — Extract structured cases + verify
 # ---------------------------------------------------------------------------
 
-EXTRACTOR_PROMPT = """\
+EXTRACTOR_INSTRUCTIONS = """\
 You are a senior financial and PR analyst at a top-tier consulting firm.
 
-Below is research gathered via Google Search about historical corporate crises \
-(including the strategies used) and their measurable outcomes.
-
-CURRENT CRISIS CONTEXT:
-{crisis_summary}
-
---- RESEARCH: PAST CRISES & STRATEGIES ---
-{crises_and_strategies}
-
---- RESEARCH: OUTCOMES & FINANCIAL IMPACT ---
-{outcomes}
---- END RESEARCH ---
+After these instructions you will find the current crisis context, then research \
+gathered via Google Search about historical corporate crises (including the \
+strategies used) and their measurable outcomes.
 
 Extract the 3 to 5 historical cases MOST analogous to the current crisis. \
 Aim for diversity — different industries, strategies, and outcomes.
@@ -318,30 +478,95 @@ For each case provide:
 8. **success_score**: 1-10 rating
 9. **lesson**: One sentence key lesson
 10. **source_url**: URL from the research
+11. **verified**: Re-read the research for this case. true only if the company, the crisis \
+    and every figure in the outcome appear in it; false otherwise
+12. **verification_note**: If not verified, what is missing from the research; else empty
 
 Also provide:
 - **global_lesson**: ONE strategic sentence synthesizing the key takeaway
 - **confidence**: 'high' if verified financial data, 'medium' if partial, 'low' if estimated
 
-RULES: Only extract cases from the research. Do NOT invent. Be specific."""
+RULES: Only extract cases from the research. Do NOT invent. Be specific.
 
-VERIFICATION_PROMPT = """\
-You are a fact-checker. Below is a list of historical crisis cases extracted by an AI analyst, \
-followed by the original research they were extracted from.
+"""
 
-For each case, verify:
-1. Is the company name actually mentioned in the research?
-2. Is the crisis description consistent with what the research says?
-3. Are the financial figures (stock drop, revenue loss) actually in the research, or fabricated?
 
-If a case is FABRICATED (company not in research, or financial figures invented), \
-respond with the case number and "FABRICATED". Otherwise respond "VERIFIED" for each.
+def _extractor_prompt(crisis_summary: str, crises_and_strategies: str, outcomes: str) -> str:
+    """Static instructions + crisis context and research."""
+    return (
+        f"{EXTRACTOR_INSTRUCTIONS}"
+        f"CURRENT CRISIS CONTEXT:\n{crisis_summary}\n\n"
+        f"--- RESEARCH: PAST CRISES & STRATEGIES ---\n{crises_and_strategies}\n\n"
+        f"--- RESEARCH: OUTCOMES & FINANCIAL IMPACT ---\n{outcomes}\n"
+        f"--- END RESEARCH ---"
+    )
 
-CASES:
-{cases}
 
-RESEARCH:
-{research}"""
+# Per research blob sent to the extractor (~10k chars of English)
+RESEARCH_MAX_TOKENS = 2500
+
+_PARAGRAPH_SPLIT_RE = re.compile(r"\n\s*\n")
+_INLINE_SPACE_RE = re.compile(r"[ \t]+")
+# Last sentence end (or line break) in a cut-off blob
+_SENTENCE_END_RE = re.compile(r"[.!?](?=\s)|\n")
+
+
+def _trim_to_sentence(text: str, max_tokens: int) -> str:
+    """Cuts text to max_tokens tokens at the last sentence boundary (raw cut if none in the second half)."""
+    cut = trim_to_tokens(text, max_tokens)
+    if len(cut) == len(text):
+        return text
+    ends = [m.end() for m in _SENTENCE_END_RE.finditer(cut, len(cut) // 2)]
+    return cut[: ends[-1]] if ends else cut
+
+
+def _compact_research(crises: str, outcomes: str, max_tokens: int = RESEARCH_MAX_TOKENS) -> tuple[str, str]:
+    """
+    Prepares both research blobs for the extractor: collapses runs of spaces,
+    drops paragraphs already seen (in either blob, e.g. repeated citation
+    footers), then trims each to max_tokens on a sentence boundary.
+    """
+    seen: set[str] = set()
+
+    def dedupe(blob: str) -> str:
+        kept = []
+        for para in _PARAGRAPH_SPLIT_RE.split(blob or ""):
+            para = _INLINE_SPACE_RE.sub(" ", para).strip()
+            norm = para.lower()
+            if para and norm not in seen:
+                seen.add(norm)
+                kept.append(para)
+        return "\n\n".join(kept)
+
+    return (
+        _trim_to_sentence(dedupe(crises), max_tokens),
+        _trim_to_sentence(dedupe(outcomes), max_tokens),
+    )
+
+
+def _verify_cases(output: Agent2Output, research_lower: str) -> Agent2Output | None:
+    """
+    Drops cases the extractor marked unverified, and cases whose company never
+    appears in the research. None if no case is left. Never raises.
+    """
+    kept = []
+    for case in output.past_cases:
+        name = case.company.strip().lower()
+        if not case.verified:
+            print(f"[AGENT 2]   Dropped {case.company}: {case.verification_note or 'unverified'}")
+        elif not name or name not in research_lower:
+            print(f"[AGENT 2]   Dropped {case.company}: not in research")
+        else:
+            kept.append(case)
+    print(f"[AGENT 2]   Verification: {len(kept)}/{len(output.past_cases)} cases kept")
+    if not kept:
+        return None
+    if len(kept) == len(output.past_cases):
+        return output
+    return output.model_copy(update={"past_cases": kept})
+
+
+_TITLE_WORD_RE = re.compile(r"\w+")
 
 
 def _match_sources_to_cases(
@@ -351,43 +576,63 @@ def _match_sources_to_cases(
 ) -> list[HistoricalCrisis]:
     """Best-effort: assign a source_url to each case by searching for the company name
     in the research text near source citations, or fall back to a Google search URL."""
+    # Word -> URL of the first source whose title contains it; a case looks up its first word
+    title_index: dict[str, str] = {}
+    for src in sources:
+        for word in _TITLE_WORD_RE.findall((src.get("title") or "").lower()):
+            title_index.setdefault(word, src["url"])
     updated = []
     for case in cases:
         if case.source_url:
             updated.append(case)
             continue
-        company_lower = case.company.lower()
-        best_url = ""
-        for src in sources:
-            title = (src.get("title") or "").lower()
-            if company_lower.split()[0] in title:
-                best_url = src["url"]
-                break
+        first_word = next(iter(_TITLE_WORD_RE.findall(case.company.lower())), "")
+        best_url = title_index.get(first_word, "")
         if not best_url:
-            best_url = f"https://www.google.com/search?q={case.company.replace(' ', '+')}+crisis+case+study"
-        updated.append(HistoricalCrisis(
-            company=case.company,
-            year=case.year,
-            crisis_summary=case.crisis_summary,
-            crisis_title=case.crisis_title,
-            crisis_type=case.crisis_type,
-            strategy_adopted=case.strategy_adopted,
-            outcome=case.outcome,
-            success_score=case.success_score,
-            lesson=case.lesson,
-            source_url=best_url,
-        ))
+            best_url = f"https://www.google.com/search?q={quote_plus(case.company)}+crisis+case+study"
+        updated.append(case.model_copy(update={"source_url": best_url}))
     return updated
 
 
+async def _extract_via_batch(prompt: str) -> Agent2Output:
+    """Pro extraction through the Batch API (half price). Raises TimeoutError past BATCH_TIMEOUT_S."""
+    name = await asyncio.to_thread(submit_batch, llm_pro.model, [prompt], Agent2Output)
+    deadline = time.monotonic() + BATCH_TIMEOUT_S
+    while await asyncio.to_thread(get_batch_status, name) not in DONE_STATES:
+        if time.monotonic() >= deadline:
+            await asyncio.to_thread(cancel_batch, name)
+            raise TimeoutError(f"Batch {name} not done after {BATCH_TIMEOUT_S}s")
+        await asyncio.sleep(BATCH_POLL_S)
+    text = (await asyncio.to_thread(retrieve_batch_results, name))[0]
+    if not text:
+        raise RuntimeError(f"Batch {name} returned no extraction.")
+    return Agent2Output.model_validate_json(text)
+
+
 def _extract_and_verify(
     research: dict[str, str],
     crisis_summary: str,
     sources: list[dict] | None = None,
-) -> Agent2Output:
+) -> tuple[Agent2Output | None, float]:
+    """Sync entry point for _extract_and_verify_async."""
+    return run_sync(_extract_and_verify_async(research, crisis_summary, sources))
+
+
+async def _extract_and_verify_async(
+    research: dict[str, str],
+    crisis_summary: str,
+    sources: list[dict] | None = None,
+    batch_mode: bool = False,
+) -> tuple[Agent2Output | None, float]:
     """
-    Step 2.3: Extract structured cases via Pro, then verify via Flash.
-    Falls back gracefully if verification fails.
+    Step 2.3: Extract structured cases via Pro, which also checks each case
+    against the research (verified flag) — one call, no separate fact-check.
+    batch_mode sends the Pro call through the Batch API (minutes to hours);
+    a failed or timed-out batch is redone in realtime.
+    Falls back to GOOGLE_API_KEY1 (independent quota) if the primary key keeps failing.
+    The verified extraction is cached on its prompt for RESEARCH_CACHE_TTL_S.
+    Returns (output, extraction cost in EUR); output is None if no extracted
+    case passes verification.
     """
     if not llm_pro:
         raise RuntimeError("GOOGLE_API_KEY missing — cannot extract cases.")
@@ -396,26 +641,149 @@ def _extract_and_verify(
     print(f"[AGENT 2]   Total research context: {total_research_len} chars")
 
     t_extract = time.time()
-    structured = llm_pro.with_structured_output(Agent2Output)
-    prompt = EXTRACTOR_PROMPT.format(
-        crisis_summary=crisis_summary,
-        crises_and_strategies=research["crises"][:10000],
-        outcomes=research["outcomes"][:10000],
-    )
-
-    output: Agent2Output = _retry_llm(lambda: structured.invoke(prompt))
-    print(f"[AGENT 2]   Extraction: {time.time() - t_extract:.1f}s, {len(output.past_cases)} cases")
+    crises_text, outcomes_text = _compact_research(research["crises"], research["outcomes"])
+    prompt = _extractor_prompt(crisis_summary, crises_text, outcomes_text)
+
+    cache_key = content_key(prompt)
+    cached = cache_get("precedent_extraction", cache_key)
+    cost_eur = 0.0
+    if cached is not None:
+        output = Agent2Output.model_validate(cached) if cached else None  # {}: none verified
+    else:
+        output = None
+        if batch_mode:
+            try:
+                output = await _extract_via_batch(prompt)
+                cost_eur = EXTRACTION_COST_EUR / 2  # Batch API: half price
+            except Exception as e:
+                print(f"[AGENT 2]   Batch extraction failed ({e}) — extracting in realtime")
+        if output is None:
+            cost_eur = EXTRACTION_COST_EUR
+            try:
+                output = await _retry_llm_async(lambda: _extractor_llm().ainvoke(prompt))
+            except Exception as e:
+                if not GOOGLE_API_KEY1 or GOOGLE_API_KEY1 == GOOGLE_API_KEY:
+                    raise
+                print(f"[AGENT 2]   Extraction failed ({e}) — retrying on GOOGLE_API_KEY1")
+                output = await _retry_llm_async(lambda: _fallback_extractor_llm().ainvoke(prompt))
+        print(f"[AGENT 2]   Extraction: {time.time() - t_extract:.1f}s, {len(output.past_cases)} cases")
+        output = _verify_cases(output, f"{crises_text}\n\n{outcomes_text}".lower())
+        cache_set("precedent_extraction", cache_key, output.model_dump() if output else {}, ttl=RESEARCH_CACHE_TTL_S)
+    if output is None:
+        print(f"[AGENT 2]   Extracted and verified: {time.time() - t_extract:.1f}s, no verified case")
+        return None, cost_eur
+    print(f"[AGENT 2]   Extracted and verified: {time.time() - t_extract:.1f}s, {len(output.past_cases)} cases")
 
     # Phase C: Match sources to cases
     if sources:
         matched_cases = _match_sources_to_cases(output.past_cases, sources, research)
-        output = Agent2Output(
-            past_cases=matched_cases,
-            global_lesson=output.global_lesson,
-            confidence=output.confidence,
+        output = output.model_copy(update={"past_cases": matched_cases})
+
+    return output, cost_eur
+
+
+# ---------------------------------------------------------------------------
+# Semantic cache — near-identical crises reuse precedents
+# ---------------------------------------------------------------------------
+
+# Next day's wording of the same scandal embeds above this cosine similarity
+SEMANTIC_CACHE_THRESHOLD = 0.92
+SEMANTIC_CACHE_MAX_PER_COMPANY = 16
+SEMANTIC_CACHE_TTL_S = 24 * 3600
+SEMANTIC_CACHE_EMBED_CHARS = 2000
+
+# Entries live in the LLM cache (sqlite-backed, survives restarts), one list per company:
+# [{"expires_at", "embedding" (base64 float16, unit norm), "result" (node result)}].
+# The lock serializes the read-modify-write of a company's list.
+_semantic_lock = threading.Lock()
+
+
+def _embed_summary(summary: str) -> np.ndarray | None:
+    """Unit-norm embedding of the crisis summary (None if embeddings are unavailable)."""
+    if embeddings is None or not summary:
+        return None
+    try:
+        vec = np.asarray(embeddings.embed_query(summary[:SEMANTIC_CACHE_EMBED_CHARS]), dtype=np.float32)
+    except Exception as e:
+        print(f"[AGENT 2] Embedding failed, semantic cache skipped: {e}")
+        return None
+    norm = np.linalg.norm(vec)
+    return vec / norm if norm else None
+
+
+def _semantic_entries(company_key: str) -> list[dict]:
+    """Unexpired semantic-cache entries for the company."""
+    now = time.time()
+    return [e for e in cache_get("semantic_precedents", company_key) or [] if e["expires_at"] > now]
+
+
+def _semantic_lookup(entries: list[dict], embedding: np.ndarray) -> dict | None:
+    """Most similar entry's result, if above the threshold."""
+    if not entries:
+        return None
+    vectors = np.stack([
+        np.frombuffer(base64.b64decode(e["embedding"]), dtype=np.float16) for e in entries
+    ]).astype(np.float32)
+    similarities = vectors @ embedding
+    best = int(np.argmax(similarities))
+    if similarities[best] < SEMANTIC_CACHE_THRESHOLD:
+        return None
+    print(f"[AGENT 2] Semantic cache hit (similarity {similarities[best]:.3f})")
+    return copy.deepcopy(entries[best]["result"])
+
+
+def _semantic_store(company_key: str, embedding: np.ndarray, result: dict) -> None:
+    """Persists a node result; a company keeps its SEMANTIC_CACHE_MAX_PER_COMPANY latest."""
+    entry = {
+        "expires_at": time.time() + SEMANTIC_CACHE_TTL_S,
+        "embedding": base64.b64encode(embedding.astype(np.float16).tobytes()).decode("ascii"),
+        "result": copy.deepcopy(result),
+    }
+    with _semantic_lock:
+        entries = _semantic_entries(company_key) + [entry]
+        cache_set(
+            "semantic_precedents", company_key, entries[-SEMANTIC_CACHE_MAX_PER_COMPANY:],
+            ttl=SEMANTIC_CACHE_TTL_S,
         )
 
-    return output
+
+# ---------------------------------------------------------------------------
+# Per-customer spend budget (token bucket, EUR)
+# ---------------------------------------------------------------------------
+
+# Upper bound of one research + extraction run (2 grounded searches + extraction), reserved
+# up front; the part not actually spent (cache hits, early exits) is refunded afterwards
+RUN_COST_EUR = GROUNDED_SEARCH_COST_EUR * 2 + EXTRACTION_COST_EUR
+# AGENT2_HOURLY_BUDGET_EUR caps each customer's Agent 2 spend per hour (unset: no cap)
+CUSTOMER_HOURLY_BUDGET_EUR = float(os.getenv("AGENT2_HOURLY_BUDGET_EUR") or 0) or None
+
+_budget_lock = threading.Lock()
+_budgets: dict[str, tuple[float, float]] = {}  # customer_id -> (EUR left, last refill time)
+
+
+def _spend_budget(customer_id: str, cost_eur: float) -> bool:
+    """Takes cost_eur from the customer's bucket (refilled continuously); False if short."""
+    if CUSTOMER_HOURLY_BUDGET_EUR is None:
+        return True
+    now = time.time()
+    with _budget_lock:
+        left, last = _budgets.get(customer_id, (CUSTOMER_HOURLY_BUDGET_EUR, now))
+        left = min(CUSTOMER_HOURLY_BUDGET_EUR, left + (now - last) * CUSTOMER_HOURLY_BUDGET_EUR / 3600)
+        if left < cost_eur:
+            _budgets[customer_id] = (left, now)
+            return False
+        _budgets[customer_id] = (left - cost_eur, now)
+        return True
+
+
+def _refund_budget(customer_id: str, cost_eur: float) -> None:
+    """Returns unspent EUR (reserved by _spend_budget) to the customer's bucket."""
+    if CUSTOMER_HOURLY_BUDGET_EUR is None or cost_eur <= 0:
+        return
+    with _budget_lock:
+        if customer_id in _budgets:
+            left, last = _budgets[customer_id]
+            _budgets[customer_id] = (min(CUSTOMER_HOURLY_BUDGET_EUR, left + cost_eur), last)
 
 
 # ---------------------------------------------------------------------------
@@ -439,7 +807,8 @@ def precedents_node(state: GraphState) -> dict[str, Any]:
         print(f"[AGENT 2] CRITICAL ERROR after {elapsed:.1f}s: {e}")
         traceback.print_exc()
 
-        emit_agent2_signal(
+        emit_in_background(
+            emit_agent2_signal,
             customer_external_id=customer_id,
             crisis_id=crisis_id,
             past_cases=[],
@@ -456,6 +825,31 @@ def precedents_node(state: GraphState) -> dict[str, Any]:
         }
 
 
+def _no_precedents(
+    customer_id: str,
+    crisis_id: str,
+    lesson: str,
+    sources: list[dict],
+    api_cost: float,
+) -> dict[str, Any]:
+    """Degraded result (no cases) + its Paid.ai signal."""
+    emit_in_background(
+        emit_agent2_signal,
+        customer_external_id=customer_id,
+        crisis_id=crisis_id,
+        past_cases=[],
+        global_lesson=lesson,
+        api_compute_cost_eur=round(api_cost, 4),
+    )
+    return {
+        "precedents": [],
+        "global_lesson": lesson,
+        "confidence": "low",
+        "agent2_sources": sources,
+        "agent2_api_cost_eur": round(api_cost, 4),
+    }
+
+
 def _run_pipeline(
     state: GraphState,
     customer_id: str,
@@ -472,32 +866,54 @@ def _run_pipeline(
     print(f"[AGENT 2] Severity: {agent1_output.severity_score}/5")
     print(f"[AGENT 2] Crisis: {agent1_output.crisis_summary[:150]}...")
 
-    # --- Step 2.2: Grounded Research (3 Google Search calls) ---
-    print("\n[AGENT 2] === Step 2.2: Grounded Research (3 searches) ===")
-    research, sources = _run_grounded_research(agent1_output)
-    api_cost += 0.035 * 2
+    # Nothing to research: skip the searches instead of paying for empty results
+    if not agent1_output.articles:
+        print("[AGENT 2] No articles from Agent 1 — skipping research.")
+        return _no_precedents(customer_id, crisis_id, "No crisis data available for precedent research.", [], 0.0)
+
+    # Same company, near-identical crisis within the TTL: reuse its precedents
+    company_key = agent1_output.company_name.strip().lower()
+    # Embedding only needed up front when the company has cached results to compare with
+    semantic_entries = _semantic_entries(company_key)
+    summary_embedding = _embed_summary(agent1_output.crisis_summary) if semantic_entries else None
+    cached = _semantic_lookup(semantic_entries, summary_embedding) if summary_embedding is not None else None
+    if cached is not None:
+        emit_in_background(
+            emit_agent2_signal,
+            customer_external_id=customer_id,
+            crisis_id=crisis_id,
+            past_cases=cached["precedents"],
+            global_lesson=cached["global_lesson"],
+            api_compute_cost_eur=0.0,
+        )
+        return {**cached, "agent2_api_cost_eur": 0.0}
+
+    if not _spend_budget(customer_id, RUN_COST_EUR):
+        print(f"[AGENT 2] Hourly budget exhausted for customer '{customer_id}' — skipping research.")
+        return _no_precedents(customer_id, crisis_id, "Precedent research skipped: hourly budget reached.", [], 0.0)
+
+    # --- Step 2.2: Grounded Research (2 parallel Google Search calls) ---
+    print("\n[AGENT 2] === Step 2.2: Grounded Research (2 searches) ===")
+    research, sources, api_cost = _run_grounded_research(agent1_output)
 
     if all(len(v) < 100 for v in research.values()):
         print("[AGENT 2] WARNING: All searches returned minimal results.")
-        emit_agent2_signal(
-            customer_external_id=customer_id,
-            crisis_id=crisis_id,
-            past_cases=[],
-            global_lesson="No relevant historical precedents found for this crisis type.",
-            api_compute_cost_eur=round(api_cost, 4),
+        _refund_budget(customer_id, RUN_COST_EUR - api_cost)
+        return _no_precedents(
+            customer_id, crisis_id, "No relevant historical precedents found for this crisis type.",
+            sources, api_cost,
         )
-        return {
-            "precedents": [],
-            "global_lesson": "No relevant historical precedents found for this crisis type.",
-            "confidence": "low",
-            "agent2_sources": sources,
-            "agent2_api_cost_eur": round(api_cost, 4),
-        }
 
     # --- Step 2.3: Extract & Verify ---
     print("\n[AGENT 2] === Step 2.3: Extract & Verify ===")
-    output: Agent2Output = _extract_and_verify(research, agent1_output.crisis_summary, sources)
-    api_cost += 0.005  # Flash extraction
+    output, extraction_cost = _extract_and_verify(research, agent1_output.crisis_summary, sources)
+    api_cost += extraction_cost
+    _refund_budget(customer_id, RUN_COST_EUR - api_cost)
+    if output is None:
+        return _no_precedents(
+            customer_id, crisis_id, "No verified historical precedents found for this crisis type.",
+            sources, api_cost,
+        )
 
     # --- Source-quality-driven confidence ---
     total_chars = sum(len(v) for v in research.values())
@@ -515,11 +931,7 @@ def _run_pipeline(
         confidence_rank.get(source_confidence, 1),
     )
     confidence_label = {0: "low", 1: "medium", 2: "high"}[final_confidence]
-    output = Agent2Output(
-        past_cases=output.past_cases,
-        global_lesson=output.global_lesson,
-        confidence=confidence_label,
-    )
+    output = output.model_copy(update={"confidence": confidence_label})
 
     elapsed = time.time() - t0
 
@@ -531,9 +943,10 @@ def _run_pipeline(
         print(f"[AGENT 2]   -> {case.company} (score: {case.success_score}/10): {case.strategy_adopted[:80]}{src}")
     print(f"[AGENT 2]   Lesson: {output.global_lesson}")
 
-    past_cases_dicts = [c.model_dump() for c in output.past_cases]
+    past_cases_dicts = output.model_dump(include={"past_cases"})["past_cases"]
 
-    emit_agent2_signal(
+    emit_in_background(
+        emit_agent2_signal,
         customer_external_id=customer_id,
         crisis_id=crisis_id,
         past_cases=past_cases_dicts,
@@ -541,13 +954,18 @@ def _run_pipeline(
         api_compute_cost_eur=round(api_cost, 4),
     )
 
-    return {
+    result = {
         "precedents": past_cases_dicts,
         "global_lesson": output.global_lesson,
         "confidence": confidence_label,
         "agent2_sources": sources,
         "agent2_api_cost_eur": round(api_cost, 4),
     }
+    if summary_embedding is None:
+        summary_embedding = _embed_summary(agent1_output.crisis_summary)
+    if summary_embedding is not None:
+        _semantic_store(company_key, summary_embedding, result)
+    return result
 
 
 # ---------------------------------------------------------------------------
@@ -559,13 +977,33 @@ def precedents_node_from_topic(
     topic_name: str,
     topic_summary: str,
     articles: list[dict],
+    batch_mode: bool = False,
+    customer_id: str = "",
+) -> dict[str, Any]:
+    """Sync entry point for precedents_node_from_topic_async (worker threads, scripts)."""
+    return run_sync(precedents_node_from_topic_async(
+        company_name, topic_name, topic_summary, articles, batch_mode, customer_id,
+    ))
+
+
+async def precedents_node_from_topic_async(
+    company_name: str,
+    topic_name: str,
+    topic_summary: str,
+    articles: list[dict],
+    batch_mode: bool = False,
+    customer_id: str = "",
 ) -> dict[str, Any]:
     """
     Run Agent 2 for a single user-selected topic.
 
     Builds an Agent1Output from the provided topic data (no GraphState),
     then runs grounded research (step 2.2) and extract+verify (step 2.3).
-    Returns the same dict structure as precedents_node.
+    Returns the same dict structure as precedents_node. Awaitable from the
+    API's event loop: every Gemini call is async.
+    Shares the semantic cache and the hourly budget with precedents_node
+    (budget keyed by customer_id, else by company).
+    batch_mode (backfills only): extraction via the half-price Batch API.
     """
     t0 = time.time()
 
@@ -584,17 +1022,16 @@ def precedents_node_from_topic(
             max_severity = max(max_severity, min(max(int(sev), 1), 5))
 
         # Build a structured summary from articles
+        display_name = SUBJECT_DISPLAY_NAMES.get
         summary_parts = [f"Topic: {topic_name} — {topic_summary}"]
-        for i, ad in enumerate(article_details[:10], 1):
-            subj_display = SUBJECT_DISPLAY_NAMES.get(ad.subject, ad.subject)
-            summary_parts.append(
-                f"Article {i} [{subj_display}, severity {ad.severity_score}/5]: {ad.summary}"
-            )
-        crisis_summary = "\n".join(summary_parts)
+        summary_parts += [
+            f"Article {i} [{display_name(ad.subject, ad.subject)}, severity {ad.severity_score}/5]: {ad.summary}"
+            for i, ad in enumerate(islice(article_details, 10), 1)
+        ]
 
         agent1_output = Agent1Output(
             company_name=company_name,
-            crisis_summary=crisis_summary,
+            **_summary_variants("\n".join(summary_parts)),
             severity_score=max_severity,
             primary_threat_category=topic_name,
             articles=article_details,
@@ -603,22 +1040,54 @@ def precedents_node_from_topic(
         print(f"[AGENT 2] Topic-based run for: {company_name} / {topic_name}")
         print(f"[AGENT 2] Severity: {max_severity}/5, Articles: {len(article_details)}")
 
+        # Same company, near-identical crisis within the TTL: reuse its precedents
+        company_key = company_name.strip().lower()
+        semantic_entries = _semantic_entries(company_key)
+        summary_embedding = (
+            await asyncio.to_thread(_embed_summary, agent1_output.crisis_summary) if semantic_entries else None
+        )
+        cached = _semantic_lookup(semantic_entries, summary_embedding) if summary_embedding is not None else None
+        if cached is not None:
+            return {**cached, "agent2_api_cost_eur": 0.0}
+
+        budget_key = customer_id or company_key
+        if not _spend_budget(budget_key, RUN_COST_EUR):
+            print(f"[AGENT 2] Hourly budget exhausted for '{budget_key}' — skipping research.")
+            return {
+                "precedents": [],
+                "global_lesson": "Precedent research skipped: hourly budget reached.",
+                "confidence": "low",
+                "agent2_api_cost_eur": 0.0,
+            }
+
         # Step 2.2: Grounded Research
-        print("\n[AGENT 2] === Step 2.2: Grounded Research (3 searches) ===")
-        research, sources = _run_grounded_research(agent1_output)
+        print("\n[AGENT 2] === Step 2.2: Grounded Research (2 searches) ===")
+        research, sources, api_cost = await _run_grounded_research_async(agent1_output)
 
         if all(len(v) < 100 for v in research.values()):
             print("[AGENT 2] WARNING: All searches returned minimal results.")
+            _refund_budget(budget_key, RUN_COST_EUR - api_cost)
             return {
                 "precedents": [],
                 "global_lesson": "No relevant historical precedents found for this crisis type.",
                 "confidence": "low",
-                "agent2_api_cost_eur": 0.105,  # 3 searches still ran
+                "agent2_api_cost_eur": round(api_cost, 4),
             }
 
         # Step 2.3: Extract & Verify
         print("\n[AGENT 2] === Step 2.3: Extract & Verify ===")
-        output: Agent2Output = _extract_and_verify(research, crisis_summary, sources)
+        output, extraction_cost = await _extract_and_verify_async(
+            research, agent1_output.crisis_summary, sources, batch_mode=batch_mode,
+        )
+        api_cost += extraction_cost
+        _refund_budget(budget_key, RUN_COST_EUR - api_cost)
+        if output is None:
+            return {
+                "precedents": [],
+                "global_lesson": "No verified historical precedents found for this crisis type.",
+                "confidence": "low",
+                "agent2_api_cost_eur": round(api_cost, 4),
+            }
 
         # Source-quality-driven confidence
         total_chars = sum(len(v) for v in research.values())
@@ -638,7 +1107,7 @@ def precedents_node_from_topic(
         confidence_label = {0: "low", 1: "medium", 2: "high"}[final_confidence]
 
         elapsed = time.time() - t0
-        past_cases_dicts = [c.model_dump() for c in output.past_cases]
+        past_cases_dicts = output.model_dump(include={"past_cases"})["past_cases"]
 
         print(f"\n[AGENT 2] Done in {elapsed:.1f}s")
         print(f"[AGENT 2] Cases: {len(past_cases_dicts)} | Confidence: {confidence_label}")
@@ -646,14 +1115,18 @@ def precedents_node_from_topic(
             print(f"[AGENT 2]   -> {case.company} (score: {case.success_score}/10)")
         print(f"[AGENT 2]   Lesson: {output.global_lesson}")
 
-        api_cost = (0.035 * 2) + 0.005
-
-        return {
+        result = {
             "precedents": past_cases_dicts,
             "global_lesson": output.global_lesson,
             "confidence": confidence_label,
+            "agent2_sources": sources,
             "agent2_api_cost_eur": round(api_cost, 4),
         }
+        if summary_embedding is None:
+            summary_embedding = await asyncio.to_thread(_embed_summary, agent1_output.crisis_summary)
+        if summary_embedding is not None:
+            _semantic_store(company_key, summary_embedding, result)
+        return result
 
     except Exception as e:
         elapsed = time.time() - t0
@@ -665,3 +1138,37 @@ def precedents_node_from_topic(
             "confidence": "low",
             "agent2_api_cost_eur": 0.0,
         }
+
+
+async def precedents_batch(
+    topics: list[dict],
+    on_progress: Callable[[int, int], None] | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Runs precedents_node_from_topic_async for several topics in one event loop.
+    Each topic dict holds its keyword arguments (company_name, topic_name,
+    topic_summary, articles). Grounded searches share the loop's
+    GROUNDED_MAX_CONCURRENCY slots. on_progress(done, total) fires as topics finish.
+    Results keep the order of `topics`.
+    """
+    done = 0
+
+    async def run(topic: dict) -> dict[str, Any]:
+        nonlocal done
+        try:
+            return await precedents_node_from_topic_async(**topic)
+        finally:
+            done += 1
+            if on_progress:
+                on_progress(done, len(topics))
+
+    results = await asyncio.gather(*(run(t) for t in topics), return_exceptions=True)
+    return [
+        r if not isinstance(r, BaseException) else {
+            "precedents": [],
+            "global_lesson": "Analysis could not be completed due to a technical error.",
+            "confidence": "low",
+            "agent2_api_cost_eur": 0.0,
+        }
+        for r in results
+    ]
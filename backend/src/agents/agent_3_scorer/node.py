@@ -8,14 +8,26 @@ Uses dampened formulas to avoid overestimation:
 - Churn: correlated to Authority (exposure) and Severity
 - Deduplication: multi-article VaR uses decreasing weights (1.0, 0.2, 0.1, ...)
 """
+import asyncio
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import numpy as np
 
 from src.graph.state import GraphState
-from src.clients.llm_client import llm_flash_alt as llm
+from src.clients.http import loop_local, run_sync
+from src.clients.llm_client import GOOGLE_API_KEY1, llm_flash_alt as llm, loop_llm
 from src.shared.types import ArticleTopicAndViral
 from src.utils.paid_helpers import emit_agent3_signal
 
+
+def _topic_llm():
+    """Structured-output binding built once per event loop (async Gemini clients cannot cross loops)."""
+    return loop_local(
+        "agent3_topic",
+        lambda: loop_llm(GOOGLE_API_KEY1).with_structured_output(ArticleTopicAndViral),
+    )
+
+
 # --- Simulation constants (Hackathon) ---
 
 CAC = 100  # Cost per Acquired Customer in EUR
@@ -27,6 +39,9 @@ ACQUISITION_CONVERSION_RATE = 0.005  # 0.5% of reach are lost prospects
 EXPOSURE_RATE = 0.1  # 10% of clients exposed to tier-1 news
 CHURN_RATE_FACTOR = 0.1  # Dampening: not all exposed clients churn
 
+# Max concurrent per-article Gemini calls
+MAX_CONCURRENT_ARTICLES = 5
+
 # Deduplication weights: 1st article 100%, 2nd 20%, 3rd+ 10%
 DEDUP_WEIGHTS = [1.0, 0.2, 0.1]
 
@@ -48,13 +63,8 @@ def _get_topic_weight(topic: str) -> float:
     return TOPIC_WEIGHTS.get(topic.strip().lower(), 1.0)
 
 
-def _analyze_topic_and_viral(title: str, content: str) -> ArticleTopicAndViral | None:
-    """Calls Gemini to classify topic and viral coefficient."""
-    if not llm:
-        print("[AGENT 3] Gemini client not configured (GOOGLE_API_KEY missing).")
-        return None
-    structured_llm = llm.with_structured_output(ArticleTopicAndViral)
-    prompt = """You are an expert in media risk analysis.
+# Topic prompt split around its two holes: plain concatenation, no format parsing per call
+_TOPIC_PROMPT_HEAD = """You are an expert in media risk analysis.
 
 For this article, identify:
 1. **topic**: One of the 5 EXACT categories (write exactly as below):
@@ -70,13 +80,22 @@ For this article, identify:
    - 1.5: Outrage, dark humor, ecology, privacy
    - 2.5: Celebrity/Top Manager scandal, polarizing topic
 
-Title: {title}
-Excerpt: {content}
+Title: """
+_TOPIC_PROMPT_MID = "\nExcerpt: "
+_TOPIC_PROMPT_TAIL = """
 
 Respond only with topic and viral_coefficient.
-""".format(title=title[:200], content=(content or "")[:1500])
+"""
+
+
+async def _analyze_topic_and_viral(title: str, content: str) -> ArticleTopicAndViral | None:
+    """Calls Gemini to classify topic and viral coefficient."""
+    if not llm:
+        print("[AGENT 3] Gemini client not configured (GOOGLE_API_KEY missing).")
+        return None
+    prompt = f"{_TOPIC_PROMPT_HEAD}{title[:200]}{_TOPIC_PROMPT_MID}{(content or '')[:1500]}{_TOPIC_PROMPT_TAIL}"
     try:
-        result = structured_llm.invoke(prompt)
+        result = await _topic_llm().ainvoke(prompt)
         # Ensure viral_coefficient is a standard value
         v = result.viral_coefficient
         if v <= 1.0:
@@ -133,14 +152,15 @@ def _compute_value_at_risk(
     return acquisition_loss + churn_loss
 
 
-def _enrich_single_article(art: dict) -> dict | None:
-    """Enrich a single article with risk metrics. Thread-safe."""
+async def _enrich_single_article(art: dict, sem: asyncio.Semaphore) -> dict | None:
+    """Enrich a single article with risk metrics."""
     title = art.get("title", "")
     content = art.get("content", "")
     authority_score = int(art.get("authority_score", 3))
     severity_score = int(art.get("severity_score", 2))
 
-    topic_viral = _analyze_topic_and_viral(title, content)
+    async with sem:
+        topic_viral = await _analyze_topic_and_viral(title, content)
     if topic_viral:
         topic_weight = _get_topic_weight(topic_viral.topic)
         viral_coefficient = float(topic_viral.viral_coefficient)
@@ -170,6 +190,37 @@ def _enrich_single_article(art: dict) -> dict | None:
     }
 
 
+async def _enrich_articles(articles: list[dict]) -> list[dict]:
+    """
+    Enriches all articles concurrently (Gemini calls bounded by a semaphore).
+    Keeps the input order; an article that fails is logged and dropped.
+    """
+    sem = asyncio.Semaphore(MAX_CONCURRENT_ARTICLES)
+    results = await asyncio.gather(
+        *(_enrich_single_article(art, sem) for art in articles), return_exceptions=True
+    )
+    enriched = []
+    for art, res in zip(articles, results):
+        if isinstance(res, BaseException):
+            print(f"[AGENT 3] Error enriching '{art.get('title', '?')[:50]}': {res}")
+        elif res:
+            enriched.append(res)
+    return enriched
+
+
+def _deduplicated_var(articles: list[dict]) -> float:
+    """
+    Deduplication: VaR sorted desc, weighted 1.0, 0.2, 0.1, ... (0.1 past DEDUP_WEIGHTS).
+    One dot product over the whole batch.
+    """
+    n = len(articles)
+    var = np.sort(np.fromiter((a["value_at_risk"] for a in articles), dtype=np.float64, count=n))[::-1]
+    weights = np.full(n, 0.1)
+    k = min(n, len(DEDUP_WEIGHTS))
+    weights[:k] = DEDUP_WEIGHTS[:k]
+    return float(var @ weights)
+
+
 def scorer_node(state: GraphState) -> dict:
     """
     Agent 3: analyzes each article, computes Reach, Churn Risk, VaR.
@@ -189,30 +240,12 @@ def scorer_node(state: GraphState) -> dict:
             "articles": [],
         }
 
-    enriched_articles = []
-    max_severity = 0
-
-    with ThreadPoolExecutor(max_workers=5) as pool:
-        futures = {pool.submit(_enrich_single_article, art): art for art in articles}
-        for future in as_completed(futures):
-            try:
-                result = future.result()
-                if result:
-                    enriched_articles.append(result)
-                    max_severity = max(max_severity, int(result.get("severity_score", 0)))
-            except Exception as e:
-                title = futures[future].get("title", "?")
-                print(f"[AGENT 3] Error enriching '{title[:50]}': {e}")
+    enriched_articles = run_sync(_enrich_articles(articles))
+    max_severity = max((int(a.get("severity_score", 0)) for a in enriched_articles), default=0)
 
     print(f"[AGENT 3] Parallel enrichment: {time.time() - t0:.1f}s ({len(enriched_articles)} articles)")
 
-    # Deduplication: sort by VaR desc, apply decreasing weights (1.0, 0.2, 0.1, ...)
-    sorted_by_var = sorted(enriched_articles, key=lambda a: a["value_at_risk"], reverse=True)
-    total_var_impact = 0.0
-    for i, art in enumerate(sorted_by_var):
-        w = DEDUP_WEIGHTS[i] if i < len(DEDUP_WEIGHTS) else 0.1
-        total_var_impact += art["value_at_risk"] * w
-    total_var_impact = round(total_var_impact, 2)
+    total_var_impact = round(_deduplicated_var(enriched_articles), 2)
     estimated_financial_loss = total_var_impact
 
     # Paid.ai signal (only if articles were analyzed)
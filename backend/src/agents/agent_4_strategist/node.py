@@ -18,9 +18,14 @@ from src.graph.state import GraphState
 from src.clients.llm_client import llm_pro_alt as llm_pro, llm_flash_alt as llm_flash
 from src.shared.types import Agent4Output
 from src.utils.paid_helpers import emit_agent4_signal
+from src.utils.retry import MAX_RETRIES, is_retryable, next_delay
 
 
-MAX_LLM_RETRIES = 3
+MAX_LLM_RETRIES = MAX_RETRIES
+
+# Structured-output binding built once: Pro when configured, else Flash
+_use_llm = llm_pro or llm_flash
+_STRATEGIST_LLM = _use_llm.with_structured_output(Agent4Output) if _use_llm else None
 
 STRATEGIST_PROMPT = """\
 You are an elite crisis communications strategist at a Fortune 500 PR firm.
@@ -101,15 +106,19 @@ CRITICAL RULES:
 
 def _retry_llm(fn, retries: int = MAX_LLM_RETRIES):
     last_err = None
+    delay = 0.0
     for attempt in range(1, retries + 1):
         try:
             return fn()
         except Exception as e:
             last_err = e
             print(f"[AGENT 4] LLM call failed (attempt {attempt}/{retries}): {e}")
+            if not is_retryable(e):
+                break
             if attempt < retries:
-                time.sleep(2 ** attempt)
-    raise RuntimeError(f"LLM call failed after {retries} attempts: {last_err}")
+                delay = next_delay(e, delay)
+                time.sleep(delay)
+    raise RuntimeError(f"LLM call failed after {attempt} attempts: {last_err}")
 
 
 def _build_articles_block(articles: list[dict]) -> str:
@@ -199,15 +208,13 @@ def _run_strategist(
         confidence=confidence,
     )
 
-    use_llm = llm_pro or llm_flash
-    if not use_llm:
+    if not _STRATEGIST_LLM:
         raise RuntimeError("No LLM configured (GOOGLE_API_KEY missing).")
 
     model_name = "Pro" if llm_pro else "Flash"
     print(f"[AGENT 4] Calling Gemini {model_name} with structured output...")
 
-    structured = use_llm.with_structured_output(Agent4Output)
-    output: Agent4Output = _retry_llm(lambda: structured.invoke(prompt))
+    output: Agent4Output = _retry_llm(lambda: _STRATEGIST_LLM.invoke(prompt))
 
     api_cost = 0.02 if llm_pro else 0.005
 
@@ -25,9 +25,11 @@ load_dotenv(_env_backend, override=True)
 
 from src.graph.state import GraphState
 from src.clients.llm_client import llm_pro_alt as llm_pro, llm_flash_alt as llm_flash
+from src.clients.http import http_session
+from src.utils.retry import MAX_RETRIES, is_retryable, next_delay
 
 
-MAX_LLM_RETRIES = 3
+MAX_LLM_RETRIES = MAX_RETRIES
 SEVERITY_THRESHOLD = 1
 
 LANDING_PAGE_SYSTEM_PROMPT = """\
@@ -66,15 +68,19 @@ Generate the complete HTML landing page now."""
 
 def _retry_llm(fn, retries: int = MAX_LLM_RETRIES):
     last_err = None
+    delay = 0.0
     for attempt in range(1, retries + 1):
         try:
             return fn()
         except Exception as e:
             last_err = e
             print(f"[AGENT 6] LLM call failed (attempt {attempt}/{retries}): {e}")
+            if not is_retryable(e):
+                break
             if attempt < retries:
-                time.sleep(2 ** attempt)
-    raise RuntimeError(f"LLM call failed after {retries} attempts: {last_err}")
+                delay = next_delay(e, delay)
+                time.sleep(delay)
+    raise RuntimeError(f"LLM call failed after {attempt} attempts: {last_err}")
 
 
 # ── Step 1: HTML Generation via LLM ─────────────────────────────────────
@@ -155,7 +161,7 @@ def deploy_to_vercel(html_content: str, company_name: str) -> str:
     url = "https://api.vercel.com/v13/deployments?skipAutoDetectionConfirmation=1"
     print(f"[AGENT 6] [VERCEL] Deploying {project_name}...")
     try:
-        resp = requests.post(
+        resp = http_session.post(
             url,
             json=payload,
             headers=headers,
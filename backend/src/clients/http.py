@@ -0,0 +1,126 @@
+"""
+Shared HTTP connection pools.
+
+Reusing connections skips a TCP + TLS handshake per call (Jina fetches,
+Vercel deploys, async fetches from the API server).
+
+http_session        : pooled requests.Session for sync callers
+get_async_client()  : pooled httpx.AsyncClient (HTTP/2 when `h2` is installed),
+                      one per event loop — httpx connections cannot cross loops
+aclose_async_clients: closes the async clients (FastAPI lifespan shutdown)
+loop_local(key, factory): one object per running event loop, for SDK clients
+                      whose async connections are bound to the loop that
+                      first used them (Gemini ainvoke)
+run_sync(coro)      : runs a coroutine on one long-lived background loop and
+                      blocks for its result — the sync entry points (graph
+                      nodes, API worker threads) use it instead of asyncio.run,
+                      so their pools and loop_local clients are built once
+SDK_CLIENT_ARGS     : httpx kwargs (HTTP/2, pool limits) for SDKs that build
+                      their own clients — passed as client_args to Gemini
+
+Tavily is not routed through here: TavilyClient keeps its own requests.Session
+(and sets its API key on it). Each module-level ChatGoogleGenerativeAI instance
+holds its own persistent httpx clients, configured with SDK_CLIENT_ARGS.
+"""
+import asyncio
+import threading
+import weakref
+from typing import Any, Awaitable, Callable, Hashable, TypeVar
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import h2  # noqa: F401 — enables HTTP/2 in httpx
+    _HTTP2 = True
+except ImportError:
+    _HTTP2 = False
+
+DEFAULT_TIMEOUT_S = 30
+MAX_KEEPALIVE_CONNECTIONS = 100
+MAX_CONNECTIONS = 200
+
+_LIMITS = httpx.Limits(
+    max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+    max_connections=MAX_CONNECTIONS,
+)
+SDK_CLIENT_ARGS = {"http2": _HTTP2, "limits": _LIMITS}
+
+http_session = requests.Session()
+_adapter = HTTPAdapter(pool_connections=20, pool_maxsize=MAX_KEEPALIVE_CONNECTIONS)
+http_session.mount("https://", _adapter)
+http_session.mount("http://", _adapter)
+
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+    weakref.WeakKeyDictionary()
+)
+_loop_locals: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[Hashable, Any]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+T = TypeVar("T")
+_bg_loop: asyncio.AbstractEventLoop | None = None
+_bg_lock = threading.Lock()
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """Pooled AsyncClient for the running event loop (created on first use)."""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            http2=_HTTP2,
+            timeout=DEFAULT_TIMEOUT_S,
+            limits=_LIMITS,
+        )
+        _async_clients[loop] = client
+    return client
+
+
+async def aclose_async_clients() -> None:
+    """Close the client bound to the running loop (call on app shutdown)."""
+    client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+def loop_local(key: Hashable, factory: Callable[[], Any]) -> Any:
+    """factory() result for the running loop, built once per (loop, key)."""
+    loop = asyncio.get_running_loop()
+    objects = _loop_locals.get(loop)
+    if objects is None:
+        objects = _loop_locals[loop] = {}
+    obj = objects.get(key)
+    if obj is None:
+        obj = objects[key] = factory()
+    return obj
+
+
+def _background_loop() -> asyncio.AbstractEventLoop:
+    """The shared loop behind run_sync, started on first use in a daemon thread."""
+    global _bg_loop
+    with _bg_lock:
+        if _bg_loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="async-bridge", daemon=True).start()
+            _bg_loop = loop
+        return _bg_loop
+
+
+def run_sync(coro: Awaitable[T]) -> T:
+    """Blocking run of coro on the shared background loop (not callable from that loop)."""
+    loop = _background_loop()
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        coro.close()
+        raise RuntimeError("run_sync called from its own event loop — await the coroutine instead.")
+    future = asyncio.run_coroutine_threadsafe(coro, loop)
+    try:
+        return future.result()
+    except BaseException:
+        future.cancel()
+        raise
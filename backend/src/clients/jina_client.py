@@ -3,11 +3,17 @@ Jina Reader client — fetches URL and returns clean Markdown.
 
 Uses https://r.jina.ai/{url} to extract main article content, removing
 HTML, scripts, sidebars, ads. Fallback when Tavily content is noisy.
+Requests go through the shared connection pools (src/clients/http.py).
 """
+import httpx
 import requests
 
+from src.clients.http import get_async_client, http_session
 
-def get_markdown_content(url: str, timeout: int = 10) -> str | None:
+
+def get_markdown_content(
+    url: str, timeout: int = 10, session: requests.Session | None = None
+) -> str | None:
     """
     Fetches URL via Jina Reader, returns clean Markdown or None on failure.
 
@@ -18,7 +24,23 @@ def get_markdown_content(url: str, timeout: int = 10) -> str | None:
         return None
     jina_url = f"https://r.jina.ai/{url}"
     try:
-        response = requests.get(jina_url, timeout=timeout)
+        response = (session or http_session).get(jina_url, timeout=timeout)
+        if response.status_code == 200 and response.text.strip():
+            return response.text.strip()
+        return None
+    except Exception:
+        return None
+
+
+async def get_markdown_content_async(
+    url: str, timeout: int = 10, client: httpx.AsyncClient | None = None
+) -> str | None:
+    """Async variant of get_markdown_content (shared AsyncClient by default)."""
+    if not url or not url.strip():
+        return None
+    jina_url = f"https://r.jina.ai/{url}"
+    try:
+        response = await (client or get_async_client()).get(jina_url, timeout=timeout)
         if response.status_code == 200 and response.text.strip():
             return response.text.strip()
         return None
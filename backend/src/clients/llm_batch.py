@@ -0,0 +1,77 @@
+"""
+Gemini Batch API — half-price generation for non-real-time runs (backfills).
+
+Jobs complete within 24h (usually minutes), so only callers that can wait
+should use this. Requests are sent inline (no file upload): a backfill submits
+a handful of extraction prompts at a time.
+
+submit_batch(model, prompts, response_schema) : creates a job, returns its name
+get_batch_status(name)                        : job state, e.g. "JOB_STATE_RUNNING"
+retrieve_batch_results(name)                  : response text per prompt (None if that request failed)
+cancel_batch(name)                            : cancels a job (e.g. past the caller's deadline)
+
+Uses GOOGLE_API_KEY (same quota as Agent 1 / Agent 2).
+"""
+from functools import lru_cache
+
+from google import genai
+from google.genai import types as genai_types
+
+from src.clients.http import SDK_CLIENT_ARGS
+from src.clients.llm_client import GOOGLE_API_KEY
+
+DONE_STATES = frozenset({
+    "JOB_STATE_SUCCEEDED",
+    "JOB_STATE_PARTIALLY_SUCCEEDED",
+    "JOB_STATE_FAILED",
+    "JOB_STATE_CANCELLED",
+    "JOB_STATE_EXPIRED",
+})
+
+
+@lru_cache(maxsize=1)
+def _client() -> genai.Client:
+    if not GOOGLE_API_KEY:
+        raise RuntimeError("GOOGLE_API_KEY missing — cannot use the Batch API.")
+    return genai.Client(
+        api_key=GOOGLE_API_KEY,
+        http_options=genai_types.HttpOptions(client_args=SDK_CLIENT_ARGS),
+    )
+
+
+def submit_batch(model: str, prompts: list[str], response_schema=None) -> str:
+    """Submits one request per prompt (JSON output if response_schema is given). Returns the job name."""
+    config = None
+    if response_schema is not None:
+        config = {"response_mime_type": "application/json", "response_schema": response_schema}
+    requests = [
+        {"contents": [{"role": "user", "parts": [{"text": prompt}]}], "config": config}
+        for prompt in prompts
+    ]
+    job = _client().batches.create(model=model, src=requests)
+    print(f"[BATCH] Submitted {job.name} ({len(prompts)} requests, {model})")
+    return job.name
+
+
+def get_batch_status(name: str) -> str:
+    """Current job state name."""
+    job = _client().batches.get(name=name)
+    return job.state.name if job.state else "JOB_STATE_UNSPECIFIED"
+
+
+def retrieve_batch_results(name: str) -> list[str | None]:
+    """Response texts in submission order; raises if the job did not succeed."""
+    job = _client().batches.get(name=name)
+    state = job.state.name if job.state else "JOB_STATE_UNSPECIFIED"
+    if state not in ("JOB_STATE_SUCCEEDED", "JOB_STATE_PARTIALLY_SUCCEEDED"):
+        raise RuntimeError(f"Batch {name} ended in {state}: {job.error}")
+    responses = (job.dest.inlined_responses if job.dest else None) or []
+    return [r.response.text if r.response and not r.error else None for r in responses]
+
+
+def cancel_batch(name: str) -> None:
+    """Best-effort cancel; never raises."""
+    try:
+        _client().batches.cancel(name=name)
+    except Exception as e:
+        print(f"[BATCH] Cancel of {name} failed: {e}")
@@ -7,11 +7,22 @@ GOOGLE_API_KEY1 : used by Agent 3, Agent 4 (independent quota, runs in parallel)
 llm_flash / llm_pro : use GOOGLE_API_KEY (Agent 1, 2)
 llm_flash_alt       : uses GOOGLE_API_KEY1 (Agent 3, 4)
 llm                 : alias for llm_flash (backwards compat with Agent 1)
+embeddings          : text embeddings on GOOGLE_API_KEY (Agent 2 semantic cache)
+
+Each instance keeps persistent httpx clients (keep-alive across calls); they are
+built with SDK_CLIENT_ARGS for HTTP/2 and a pool sized for concurrent fan-out.
+
+The module-level instances are for sync invoke only. Their async httpx client is
+bound to the first event loop that awaits it, and the agents run both on the API
+server's loop and on run_sync's background loop: async callers use loop_llm(),
+one client per loop.
 """
 import os
 from pathlib import Path
 from dotenv import load_dotenv
-from langchain_google_genai import ChatGoogleGenerativeAI
+from langchain_google_genai import ChatGoogleGenerativeAI, GoogleGenerativeAIEmbeddings
+
+from src.clients.http import SDK_CLIENT_ARGS, loop_local
 
 _env_cwd = Path.cwd() / ".env"
 _env_backend = Path(__file__).resolve().parents[2] / ".env"
@@ -26,12 +37,14 @@ llm_flash = ChatGoogleGenerativeAI(
     model="gemini-2.5-flash",
     google_api_key=GOOGLE_API_KEY,
     temperature=0,
+    client_args=SDK_CLIENT_ARGS,
 ) if GOOGLE_API_KEY else None
 
 llm_pro = ChatGoogleGenerativeAI(
     model="gemini-2.5-flash",
     google_api_key=GOOGLE_API_KEY,
     temperature=0,
+    client_args=SDK_CLIENT_ARGS,
 ) if GOOGLE_API_KEY else None
 
 # --- Key 2: Agent 3 + Agent 4 (parallel, no rate-limit collision) ---
@@ -39,13 +52,34 @@ llm_flash_alt = ChatGoogleGenerativeAI(
     model="gemini-2.5-flash",
     google_api_key=GOOGLE_API_KEY1,
     temperature=0,
+    client_args=SDK_CLIENT_ARGS,
 ) if GOOGLE_API_KEY1 else None
 
 llm_pro_alt = ChatGoogleGenerativeAI(
     model="gemini-2.5-flash",
     google_api_key=GOOGLE_API_KEY1,
     temperature=0,
+    client_args=SDK_CLIENT_ARGS,
 ) if GOOGLE_API_KEY1 else None
 
+# --- Embeddings (Agent 2: near-duplicate crisis lookup) ---
+embeddings = GoogleGenerativeAIEmbeddings(
+    model="models/gemini-embedding-001",
+    google_api_key=GOOGLE_API_KEY,
+    client_args=SDK_CLIENT_ARGS,
+) if GOOGLE_API_KEY else None
+
 # Backwards-compatible alias used by Agent 1
 llm = llm_flash
+
+
+def loop_llm(api_key: str | None = GOOGLE_API_KEY, temperature: float = 0) -> ChatGoogleGenerativeAI | None:
+    """Flash client for ainvoke in the running event loop (None without a key)."""
+    if not api_key:
+        return None
+    return loop_local(("gemini", api_key, temperature), lambda: ChatGoogleGenerativeAI(
+        model="gemini-2.5-flash",
+        google_api_key=api_key,
+        temperature=temperature,
+        client_args=SDK_CLIENT_ARGS,
+    ))
@@ -4,9 +4,11 @@ Bilingual (EN/FR) crisis keywords, no domain restriction for global coverage.
 """
 import os
 from pathlib import Path
-from tavily import TavilyClient
+from tavily import AsyncTavilyClient, TavilyClient
 from dotenv import load_dotenv
 
+from src.utils.log import get_logger
+
 # Load .env (cwd, backend/, project root)
 _env_cwd = Path.cwd() / ".env"
 _env_backend = Path(__file__).resolve().parents[2] / ".env"
@@ -16,6 +18,8 @@ load_dotenv(_env_cwd) or load_dotenv(_env_backend) or load_dotenv(_env_root)
 TAVILY_API_KEY = os.getenv("TAVILY_API_KEY")
 tavily_client = TavilyClient(api_key=TAVILY_API_KEY) if TAVILY_API_KEY else None
 
+logger = get_logger("AGENT 1")
+
 
 CRISIS_KEYWORDS = (
     'scandal OR lawsuit OR investigation OR breach OR layoff OR outage '
@@ -69,20 +73,13 @@ def _expand_company_query(company_name: str) -> str:
     return f"({quoted})"
 
 
-def search_news(company_name: str, max_results: int = 5) -> list[dict]:
-    """
-    Searches for crisis-related news about a company.
-    No domain restriction — Gemini's is_substantive_article filter handles noise.
-    """
-    if not tavily_client:
-        print("[AGENT 1] Tavily client not configured (TAVILY_API_KEY missing).")
-        return []
+def _news_query(company_name: str) -> str:
+    """Company names (with aliases) AND crisis keywords."""
+    return f'{_expand_company_query(company_name)} ({CRISIS_KEYWORDS})'
 
-    company_q = _expand_company_query(company_name)
-    query = f'{company_q} ({CRISIS_KEYWORDS})'
-    print(f"[AGENT 1] Tavily query: {query[:200]}")
 
-    response = tavily_client.search(
+def _search_kwargs(query: str, max_results: int) -> dict:
+    return dict(
         query=query,
         search_depth="advanced",
         topic="news",
@@ -90,6 +87,9 @@ def search_news(company_name: str, max_results: int = 5) -> list[dict]:
         time_range="y",
     )
 
+
+def _to_results(response: dict) -> list[dict]:
+    """Keeps the fields Agent 1 uses."""
     results = []
     for r in response.get("results", []):
         results.append({
@@ -100,3 +100,33 @@ def search_news(company_name: str, max_results: int = 5) -> list[dict]:
             "pub_date": r.get("published_date") or r.get("pub_date"),
         })
     return results
+
+
+def search_news(company_name: str, max_results: int = 5) -> list[dict]:
+    """
+    Searches for crisis-related news about a company.
+    No domain restriction — Gemini's is_substantive_article filter handles noise.
+    """
+    if not tavily_client:
+        logger.warning("Tavily client not configured (TAVILY_API_KEY missing).")
+        return []
+
+    query = _news_query(company_name)
+    logger.info("Tavily query: %s", query[:200])
+    return _to_results(tavily_client.search(**_search_kwargs(query, max_results)))
+
+
+async def search_news_async(company_name: str, max_results: int = 5) -> list[dict]:
+    """
+    Async variant of search_news. The async client is opened per call: its httpx
+    connections are bound to the running event loop, and each run has its own.
+    """
+    if not TAVILY_API_KEY:
+        logger.warning("Tavily client not configured (TAVILY_API_KEY missing).")
+        return []
+
+    query = _news_query(company_name)
+    logger.info("Tavily query: %s", query[:200])
+    async with AsyncTavilyClient(api_key=TAVILY_API_KEY) as client:
+        response = await client.search(**_search_kwargs(query, max_results))
+    return _to_results(response)
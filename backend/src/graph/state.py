@@ -9,6 +9,29 @@ Required keys for Paid.ai (set from Agent 1):
 from typing import TypedDict, Any
 
 
+class Article(TypedDict, total=False):
+    """Article record built by Agent 1 (plain dict at runtime; JSON-ready)."""
+
+    title: str
+    summary: str
+    url: str
+    content: str
+    pub_date: str | None
+    author: str
+    subject: str
+    sub_theme: str | None
+    sentiment: str
+    authority_score: int
+    severity_score: int
+    recency_multiplier: float
+    exposure_score: float
+
+    # Agent 3 enrichment
+    reach_estimate: float
+    churn_risk_percent: float
+    value_at_risk: float
+
+
 class GraphState(TypedDict, total=False):
     """Typed state of the graph."""
 
@@ -20,9 +43,11 @@ class GraphState(TypedDict, total=False):
     crisis_id: str    # Unique UUID per run (generated by Agent 1)
 
     # Agent 1 — flat list for Agents 2, 3
-    articles: list[dict[str, Any]]
+    articles: list[Article]
     # Agent 1 — grouped by subject for frontend: subject, title, summary, article_count, articles
     subjects: list[dict[str, Any]]
+    # Agent 1 — search results dropped as duplicates (Gemini calls avoided)
+    duplicates_skipped: int
 
     # Agent 2
     precedents: list[dict[str, Any]]
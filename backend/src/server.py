@@ -9,6 +9,7 @@ import json
 import sys
 import time
 from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from pathlib import Path
 from queue import Queue
 
@@ -31,14 +32,25 @@ from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
 from src.agents.agent_1_watcher.node import watcher_node
-from src.agents.agent_2_precedents.node import precedents_node_from_topic
+from src.agents.agent_2_precedents.node import precedents_node_from_topic, precedents_node_from_topic_async
 from src.agents.agent_3_scorer.node import scorer_from_articles
 from src.agents.agent_4_strategist.node import strategist_from_data
 from src.agents.agent_5_cfo.node import cfo_from_data
 from src.agents.agent_6_hijacker.node import hijacker_from_data
-from src.utils.paid_helpers import create_checkout
+from src.utils.paid_helpers import create_checkout, flush_signals
+from src.clients.http import aclose_async_clients, http_session
 
-app = FastAPI(title="Crisis PR Agent API")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Shared HTTP pools are created lazily on first use; closed on shutdown."""
+    yield
+    await asyncio.to_thread(flush_signals)
+    await aclose_async_clients()
+    http_session.close()
+
+
+app = FastAPI(title="Crisis PR Agent API", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -67,6 +79,7 @@ def search(req: SearchRequest):
         "company_name": req.company_name,
         "crisis_id": state.get("crisis_id", ""),
         "subjects": subjects,
+        "duplicates_skipped": state.get("duplicates_skipped", 0),
     }
 
 
@@ -94,6 +107,7 @@ async def _search_stream_generator(company_name: str):
                     "company_name": company_name,
                     "crisis_id": state.get("crisis_id", ""),
                     "subjects": subjects,
+                    "duplicates_skipped": state.get("duplicates_skipped", 0),
                 },
             ))
         except Exception as e:
@@ -148,9 +162,9 @@ class PrecedentsRequest(BaseModel):
 
 
 @app.post("/api/precedents")
-def precedents(req: PrecedentsRequest):
+async def precedents(req: PrecedentsRequest):
     """Run Agent 2 for a specific topic and return historical precedents."""
-    result = precedents_node_from_topic(
+    result = await precedents_node_from_topic_async(
         company_name=req.company_name,
         topic_name=req.topic_name,
         topic_summary=req.topic_summary,
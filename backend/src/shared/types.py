@@ -117,6 +117,8 @@ class Agent1Output(BaseModel):
     """Data extracted from Agent 1 state to feed Agent 2."""
     company_name: str
     crisis_summary: str
+    # Token-capped variant of crisis_summary for the grounded searches
+    crisis_summary_short: str = ""
     severity_score: int = Field(ge=1, le=5)
     primary_threat_category: str
     articles: List[ArticleDetail] = Field(default_factory=list)
@@ -134,6 +136,8 @@ class HistoricalCrisis(BaseModel):
     success_score: int = Field(ge=1, le=10, description="Score from 1 to 10 rating the strategy effectiveness")
     lesson: str = Field(default="", description="Key lesson learned from this specific case")
     source_url: str = Field(default="", description="URL of the primary source article for this case")
+    verified: bool = Field(default=True, description="False if the company, facts or figures of this case are not supported by the research")
+    verification_note: str = Field(default="", description="What could not be confirmed in the research (empty when verified)")
 
 
 class Agent2Output(BaseModel):
@@ -0,0 +1,111 @@
+"""
+Persistent cache for LLM results — skips re-paying for identical Gemini calls.
+
+The same articles resurface across runs (daily monitoring, repeated searches),
+so results are keyed by a content hash and kept for a TTL (default 24h).
+Two layers: an in-process dict in front of a small sqlite table.
+
+LLM_CACHE_PATH: sqlite file (default backend/.cache/llm_cache.sqlite3).
+Set LLM_CACHE_PATH="" to keep the cache in-process only.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+DEFAULT_TTL_S = 24 * 3600
+MEMORY_MAX_ENTRIES = 4096
+
+_DEFAULT_PATH = Path(__file__).resolve().parents[2] / ".cache" / "llm_cache.sqlite3"
+_CACHE_PATH = os.getenv("LLM_CACHE_PATH", str(_DEFAULT_PATH))
+
+_lock = threading.Lock()
+_memory: dict[str, tuple[float, Any]] = {}  # full_key -> (expires_at, value)
+_conn: sqlite3.Connection | None = None
+_db_failed = False
+
+
+def content_key(*parts: str) -> str:
+    """Short, fast content hash (blake2b-128) over the given strings."""
+    h = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        h.update(part.encode("utf-8", "surrogatepass"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def _db() -> sqlite3.Connection | None:
+    """Lazily opens the sqlite file; disables persistence on any error."""
+    global _conn, _db_failed
+    if _conn is not None or _db_failed or not _CACHE_PATH:
+        return _conn
+    try:
+        Path(_CACHE_PATH).parent.mkdir(parents=True, exist_ok=True)
+        _conn = sqlite3.connect(_CACHE_PATH, check_same_thread=False)
+        _conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache "
+            "(key TEXT PRIMARY KEY, expires_at REAL NOT NULL, value TEXT NOT NULL)"
+        )
+        _conn.commit()
+    except sqlite3.Error as e:
+        print(f"[CACHE] sqlite unavailable ({e}) — in-process cache only.")
+        _conn = None
+        _db_failed = True
+    return _conn
+
+
+def cache_get(namespace: str, key: str) -> Any | None:
+    """Returns the cached value, or None if missing/expired."""
+    full_key = f"{namespace}:{key}"
+    now = time.time()
+    with _lock:
+        hit = _memory.get(full_key)
+        if hit is not None:
+            if hit[0] > now:
+                return hit[1]
+            del _memory[full_key]
+        conn = _db()
+        if conn is None:
+            return None
+        try:
+            row = conn.execute(
+                "SELECT expires_at, value FROM llm_cache WHERE key = ?", (full_key,)
+            ).fetchone()
+        except sqlite3.Error:
+            return None
+        if row is None or row[0] <= now:
+            return None
+        value = json.loads(row[1])
+        _remember(full_key, row[0], value)
+        return value
+
+
+def cache_set(namespace: str, key: str, value: Any, ttl: float = DEFAULT_TTL_S) -> None:
+    """Stores a JSON-serializable value for `ttl` seconds."""
+    full_key = f"{namespace}:{key}"
+    expires_at = time.time() + ttl
+    with _lock:
+        _remember(full_key, expires_at, value)
+        conn = _db()
+        if conn is None:
+            return
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, expires_at, value) VALUES (?, ?, ?)",
+                (full_key, expires_at, json.dumps(value, ensure_ascii=False)),
+            )
+            conn.commit()
+        except sqlite3.Error as e:
+            print(f"[CACHE] write failed: {e}")
+
+
+def _remember(full_key: str, expires_at: float, value: Any) -> None:
+    """In-process layer; drops the oldest entries past MEMORY_MAX_ENTRIES. Caller holds _lock."""
+    _memory.pop(full_key, None)
+    _memory[full_key] = (expires_at, value)
+    while len(_memory) > MEMORY_MAX_ENTRIES:
+        _memory.pop(next(iter(_memory)))
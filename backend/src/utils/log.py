@@ -0,0 +1,40 @@
+"""
+Non-blocking logging for agents.
+
+Agent code logs through a QueueHandler (a cheap put on an in-memory queue);
+a QueueListener thread does the actual stdout writes. Hot loops never block on
+terminal I/O, and with lazy %-formatting filtered levels cost nothing.
+
+Output keeps the existing print style: "[AGENT 1] message".
+LOG_LEVEL env var sets the level (default INFO).
+"""
+import atexit
+import logging
+import os
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener
+
+_queue: queue.SimpleQueue = queue.SimpleQueue()
+_listener: QueueListener | None = None
+
+
+def _start_listener() -> None:
+    global _listener
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("[%(name)s] %(message)s"))
+    _listener = QueueListener(_queue, handler, respect_handler_level=False)
+    _listener.start()
+    atexit.register(_listener.stop)  # flush pending records on exit
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Logger named after the agent tag, e.g. get_logger("AGENT 1")."""
+    if _listener is None:
+        _start_listener()
+    logger = logging.getLogger(name)
+    if not logger.handlers:
+        logger.addHandler(QueueHandler(_queue))
+        logger.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+        logger.propagate = False
+    return logger
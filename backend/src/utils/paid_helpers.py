@@ -4,11 +4,16 @@ Paid.ai helpers — Agentic billing (Outcome Pricing).
 Each agent (2, 3, 4) emits ONE signal at the end of execution.
 Signals include api_compute_cost_eur and agent_gross_margin_percent
 to show ROI (invoiced value vs actual cost).
+
+emit_in_background sends a signal off the agent's critical path;
+flush_signals waits for the ones still in flight (app shutdown).
 """
 
 import os
 import uuid
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from pathlib import Path
+from typing import Callable
 try:
     from paid import Paid, Signal, CustomerByExternalId, ProductByExternalId
 except ImportError:
@@ -50,6 +55,29 @@ AUDIT_RISK_PERCENT = 0.0001
 CRISIS_STRATEGY_FEE_EUR = 2500.00
 
 
+# Signals are billing side effects: a small pool sends them so agents return
+# without waiting for the Paid.ai round trip. Worker threads are joined at
+# interpreter exit, so queued signals are still sent.
+SIGNAL_WORKERS = 2
+SIGNAL_FLUSH_TIMEOUT_S = 10
+
+_signal_executor = ThreadPoolExecutor(max_workers=SIGNAL_WORKERS, thread_name_prefix="paid-signal")
+_pending_signals: set[Future] = set()
+
+
+def emit_in_background(emit: Callable[..., None], **kwargs) -> None:
+    """Runs emit(**kwargs) on the signal pool; errors are already logged by _send_signal."""
+    future = _signal_executor.submit(emit, **kwargs)
+    _pending_signals.add(future)  # strong ref until done
+    future.add_done_callback(_pending_signals.discard)
+
+
+def flush_signals(timeout: float | None = SIGNAL_FLUSH_TIMEOUT_S) -> None:
+    """Waits (up to timeout) for signals still being sent."""
+    if _pending_signals:
+        wait(list(_pending_signals), timeout=timeout)
+
+
 def _build_signal(
     event_name: str,
     customer_external_id: str,
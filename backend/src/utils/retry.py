@@ -0,0 +1,77 @@
+"""
+Retry policy for Gemini calls.
+
+Client errors that cannot succeed on retry (400/401/403/404) are not retried.
+Rate limits honor the server's delay (Retry-After header, or the RetryInfo
+"retryDelay" in the error body); otherwise the wait uses decorrelated jitter
+(AWS), so parallel agents do not retry in lockstep.
+
+LLM_MAX_RETRIES, LLM_BACKOFF_BASE_S and LLM_BACKOFF_CAP_S env vars override
+the defaults (3 attempts, 1s base, 32s cap).
+
+LangChain re-raises google-genai errors as its own types; the HTTP status and
+response live on the google.genai APIError in the __cause__ chain.
+"""
+import os
+import random
+
+MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "3"))
+BACKOFF_BASE_S = float(os.getenv("LLM_BACKOFF_BASE_S", "1"))
+BACKOFF_CAP_S = float(os.getenv("LLM_BACKOFF_CAP_S", "32"))
+
+RETRYABLE_STATUS = frozenset({408, 429, 500, 502, 503, 504})
+
+
+def _api_error(e: BaseException) -> BaseException | None:
+    """First exception in the cause chain carrying an HTTP status (`code`)."""
+    seen = 0
+    while e is not None and seen < 8:
+        if isinstance(getattr(e, "code", None), int):
+            return e
+        e = e.__cause__ or e.__context__
+        seen += 1
+    return None
+
+
+def is_retryable(e: BaseException) -> bool:
+    """False for 4xx client errors other than 408/429; network and parse errors are retried."""
+    api_err = _api_error(e)
+    if api_err is None:
+        return True
+    code = api_err.code
+    return code in RETRYABLE_STATUS or code >= 500
+
+
+def _parse_seconds(value) -> float | None:
+    """'12', '12s' or '1.5s' -> seconds."""
+    try:
+        return float(str(value).strip().rstrip("s"))
+    except ValueError:
+        return None
+
+
+def server_retry_delay(e: BaseException) -> float | None:
+    """Delay requested by the server for this error, if any."""
+    api_err = _api_error(e)
+    if api_err is None:
+        return None
+    response = getattr(api_err, "response", None)
+    headers = getattr(response, "headers", None)
+    if headers is not None:
+        retry_after = headers.get("Retry-After")
+        if retry_after:
+            return _parse_seconds(retry_after)
+    details = getattr(api_err, "details", None)
+    error = details.get("error", details) if isinstance(details, dict) else {}
+    for detail in error.get("details", []) if isinstance(error, dict) else []:
+        if isinstance(detail, dict) and "retryDelay" in detail:
+            return _parse_seconds(detail["retryDelay"])
+    return None
+
+
+def next_delay(e: BaseException, prev: float) -> float:
+    """Seconds to wait before the next attempt (prev: previous wait, 0 on the first)."""
+    delay = server_retry_delay(e)
+    if delay is not None:
+        return min(delay, BACKOFF_CAP_S)
+    return min(BACKOFF_CAP_S, random.uniform(BACKOFF_BASE_S, max(prev, BACKOFF_BASE_S) * 3))
@@ -0,0 +1,57 @@
+"""
+Token-aware text trimming for LLM prompts.
+
+Character slicing over-trims ASCII and under-trims CJK/emoji-heavy text.
+Trimming by tokens keeps each excerpt at its real budget.
+
+Gemini's tokenizer is not available locally, so tiktoken's o200k_base is used
+as a close proxy. If tiktoken (or its encoding file) is unavailable, falls back
+to ~CHARS_PER_TOKEN characters per token.
+"""
+from functools import lru_cache
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None  # type: ignore[assignment]
+
+DEFAULT_ENCODING = "o200k_base"
+CHARS_PER_TOKEN = 4
+
+
+@lru_cache(maxsize=4)
+def _get_tokenizer(encoding_name: str = DEFAULT_ENCODING):
+    """Loads the encoding once per process (None if unavailable)."""
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.get_encoding(encoding_name)
+    except Exception as e:  # encoding download can fail offline
+        print(f"[TOKENS] tiktoken encoding unavailable ({e}) — using char heuristic.")
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """Approximate token count of text."""
+    if not text:
+        return 0
+    enc = _get_tokenizer()
+    if enc is None:
+        return -(-len(text) // CHARS_PER_TOKEN)
+    return len(enc.encode(text, disallowed_special=()))
+
+
+def trim_to_tokens(text: str, max_tokens: int) -> str:
+    """Returns text cut to at most max_tokens tokens (unchanged if already shorter)."""
+    if not text or max_tokens <= 0:
+        return ""
+    enc = _get_tokenizer()
+    if enc is None:
+        return text[: max_tokens * CHARS_PER_TOKEN]
+    # Cheap exit: a token is at least one character
+    if len(text) <= max_tokens:
+        return text
+    tokens = enc.encode(text, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return text
+    return enc.decode(tokens[:max_tokens])
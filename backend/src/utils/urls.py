@@ -0,0 +1,25 @@
+"""
+URL canonicalization shared by the agents' dedup passes.
+
+canonical_url: lowercased host without www./m./amp. prefix, no tracking params
+(utm_*, fbclid, gclid...), no fragment or trailing '/'. Scheme is dropped, so
+http/https copies of a page match.
+"""
+import re
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+_TRACKING_PARAMS = frozenset({"fbclid", "gclid", "mc_cid", "mc_eid"})
+
+# Host prefixes of mobile / www mirrors of the same page
+_MIRROR_HOST_RE = re.compile(r"^(?:www|m|mobile|amp)\.")
+
+
+def canonical_url(url: str) -> str:
+    """Dedup key for a URL (see module docstring)."""
+    parts = urlsplit(url.strip())
+    query = urlencode([
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_") and k.lower() not in _TRACKING_PARAMS
+    ])
+    host = _MIRROR_HOST_RE.sub("", parts.netloc.lower())
+    return urlunsplit(("", host, parts.path.rstrip("/"), query, ""))
@@ -0,0 +1,69 @@
+"""Agent 1 pure helpers: company-name pre-filter, batched score parsing, recency."""
+from datetime import datetime
+
+import pytest
+
+from src.agents.agent_1_watcher.node import (
+    _parse_batch_scores,
+    _recency_multipliers,
+    _validate_result,
+)
+
+
+@pytest.mark.parametrize("title, company", [
+    ("L'Oréal fined over ad claims", "L’Oreal"),
+    ("Société Générale hit by trading loss", "societe generale"),
+    ("Сбербанк Q3 2024", "Сбербанк"),
+    ("トヨタ 2024年 リコール", "トヨタ"),
+])
+def test_validate_result_matches_company_mentions(title, company):
+    assert _validate_result(title, company)
+
+
+@pytest.mark.parametrize("title, company", [
+    ("Totally unrelated news", "Total"),
+    ("ソニー決算", "トヨタ"),
+    ("Газпром: штраф", "Сбербанк"),
+    ("", "Amazon"),
+    ("Amazon layoffs", ""),
+])
+def test_validate_result_rejects_other_titles(title, company):
+    assert not _validate_result(title, company)
+
+
+def _score(idx: int | None = None, **overrides) -> dict:
+    item = {"summary": "s", "subject": "legal_compliance", "authority_score": 3, "severity_score": 2}
+    if idx is not None:
+        item["idx"] = idx
+    return {**item, **overrides}
+
+
+def test_parse_batch_scores_matches_items_by_idx():
+    text = f"[{_score(2, severity_score=5)}, {_score(1)}]".replace("'", '"')
+    scores = _parse_batch_scores(text, 2)
+    assert [s.severity_score for s in scores] == [2, 5]
+
+
+def test_parse_batch_scores_falls_back_to_position_and_nulls_invalid_items():
+    text = f"```json\n[{_score()}, {_score(severity_score=9)}]\n```".replace("'", '"')
+    scores = _parse_batch_scores(text, 2)
+    assert scores[0] is not None and scores[1] is None
+
+
+@pytest.mark.parametrize("text", ["not json", '{"idx": 1}', f"[{_score()}]".replace("'", '"')])
+def test_parse_batch_scores_rejects_unusable_replies(text):
+    assert _parse_batch_scores(text, 2) is None
+
+
+def test_recency_multipliers_buckets():
+    now = datetime(2025, 6, 30, 12, 0)
+    dates = [
+        "2025-06-30T11:00:00",  # 1h
+        "2025-06-28T12:00:00",  # 2d
+        "2025-06-25T12:00:00",  # 5d
+        "2025-06-10T12:00:00",  # 20d
+        "2025-01-01T12:00:00",  # archive
+        None,
+        "yesterday-ish",
+    ]
+    assert _recency_multipliers(dates, now).tolist() == [3.0, 1.5, 1.2, 1.0, 0.7, 1.0, 1.0]
@@ -0,0 +1,85 @@
+"""Agent 2 pure helpers: research compaction, case verification, spend budget."""
+import pytest
+
+import src.agents.agent_2_precedents.node as agent2
+from src.shared.types import Agent2Output, HistoricalCrisis
+
+
+def _case(company: str, verified: bool = True) -> HistoricalCrisis:
+    return HistoricalCrisis(
+        company=company,
+        crisis_summary="summary",
+        strategy_adopted="apology",
+        outcome="contained",
+        success_score=7,
+        verified=verified,
+    )
+
+
+def _output(*cases: HistoricalCrisis) -> Agent2Output:
+    return Agent2Output(past_cases=list(cases), global_lesson="Act fast.")
+
+
+def test_compact_research_collapses_spaces_and_drops_repeated_paragraphs():
+    footer = "Sources:   example.com"
+    crises, outcomes = agent2._compact_research(
+        f"Volkswagen   recalled cars.\n\n{footer}",
+        f"Stock fell 30%.\n\n{footer.upper()}",
+    )
+    assert crises == "Volkswagen recalled cars.\n\nSources: example.com"
+    assert outcomes == "Stock fell 30%."
+
+
+def test_compact_research_trims_on_a_sentence_boundary():
+    blob = " ".join(f"Sentence number {i} is here." for i in range(400))
+    crises, _ = agent2._compact_research(blob, "", max_tokens=50)
+    assert len(crises) < len(blob)
+    assert crises.endswith(".")
+
+
+def test_verify_cases_keeps_verified_cases_found_in_research():
+    output = _output(_case("Volkswagen"), _case("Boeing", verified=False), _case("Enron"))
+    verified = agent2._verify_cases(output, "volkswagen recalled cars after the scandal")
+    assert [c.company for c in verified.past_cases] == ["Volkswagen"]
+
+
+def test_verify_cases_returns_same_output_when_all_kept():
+    output = _output(_case("Volkswagen"))
+    assert agent2._verify_cases(output, "volkswagen") is output
+
+
+def test_verify_cases_returns_none_when_nothing_is_kept():
+    assert agent2._verify_cases(_output(_case("Enron", verified=False)), "enron") is None
+
+
+@pytest.fixture
+def budget(monkeypatch):
+    clock = {"now": 1000.0}
+    monkeypatch.setattr(agent2, "CUSTOMER_HOURLY_BUDGET_EUR", 0.2)
+    monkeypatch.setattr(agent2, "_budgets", {})
+    monkeypatch.setattr(agent2.time, "time", lambda: clock["now"])
+    return clock
+
+
+def test_spend_budget_denies_once_the_bucket_is_empty(budget):
+    assert agent2._spend_budget("c1", 0.15)
+    assert not agent2._spend_budget("c1", 0.15)
+    assert agent2._spend_budget("c2", 0.15)  # buckets are per customer
+
+
+def test_spend_budget_refills_over_the_hour(budget):
+    assert agent2._spend_budget("c1", 0.2)
+    budget["now"] += 1800  # half an hour refills half the hourly budget
+    assert agent2._spend_budget("c1", 0.1)
+    assert not agent2._spend_budget("c1", 0.05)
+
+
+def test_refund_budget_returns_unspent_reservation(budget):
+    assert agent2._spend_budget("c1", agent2.RUN_COST_EUR)
+    agent2._refund_budget("c1", agent2.RUN_COST_EUR)
+    assert agent2._budgets["c1"][0] == pytest.approx(0.2)
+
+
+def test_spend_budget_without_cap_always_allows(monkeypatch):
+    monkeypatch.setattr(agent2, "CUSTOMER_HOURLY_BUDGET_EUR", None)
+    assert agent2._spend_budget("c1", 1e9)
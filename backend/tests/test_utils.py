@@ -0,0 +1,60 @@
+"""src.utils helpers: URL canonicalization and the LLM retry policy."""
+import pytest
+
+from src.utils.retry import BACKOFF_BASE_S, BACKOFF_CAP_S, is_retryable, next_delay
+from src.utils.urls import canonical_url
+
+
+@pytest.mark.parametrize("a, b", [
+    ("https://www.example.com/news/", "http://example.com/news"),
+    ("https://m.example.com/a?utm_source=x&id=3", "https://example.com/a?id=3"),
+    ("https://example.com/a?fbclid=abc#comments", "https://EXAMPLE.com/a"),
+])
+def test_canonical_url_matches_copies_of_a_page(a, b):
+    assert canonical_url(a) == canonical_url(b)
+
+
+def test_canonical_url_keeps_meaningful_query():
+    assert canonical_url("https://example.com/a?id=3") != canonical_url("https://example.com/a?id=4")
+
+
+class _APIError(Exception):
+    def __init__(self, code: int, details: dict | None = None):
+        super().__init__(f"HTTP {code}")
+        self.code = code
+        self.details = details
+
+
+def _wrapped(code: int, details: dict | None = None) -> Exception:
+    """An SDK error re-raised by LangChain: the status lives on __cause__."""
+    try:
+        try:
+            raise _APIError(code, details)
+        except _APIError as e:
+            raise RuntimeError("wrapped") from e
+    except RuntimeError as e:
+        return e
+
+
+@pytest.mark.parametrize("code, retryable", [
+    (400, False), (401, False), (403, False), (404, False),
+    (408, True), (429, True), (500, True), (503, True),
+])
+def test_is_retryable_by_status(code, retryable):
+    assert is_retryable(_wrapped(code)) is retryable
+
+
+def test_is_retryable_without_status():
+    assert is_retryable(ValueError("bad JSON"))
+
+
+def test_next_delay_honors_server_retry_delay():
+    error = _wrapped(429, {"error": {"details": [{"retryDelay": "7s"}]}})
+    assert next_delay(error, 0.0) == min(7.0, BACKOFF_CAP_S)
+
+
+def test_next_delay_jitter_stays_within_bounds():
+    prev = 0.0
+    for _ in range(50):
+        prev = next_delay(ValueError("timeout"), prev)
+        assert BACKOFF_BASE_S <= prev <= BACKOFF_CAP_S